@@ -1,29 +1,157 @@
+import argparse
+import asyncio
+import bisect
+import copy
+import heapq
+import os
+import pickle
+import re
+import sqlite3
+from array import array
+from contextlib import contextmanager
+from functools import lru_cache
+import numpy as np
 import pandas as pd
+from scipy import sparse
 import tkinter as tk
-from tkinter import messagebox, ttk, Canvas, Scrollbar
+from tkinter import messagebox, ttk, Scrollbar
+from tkinter import font as tkfont
+from concurrent.futures import ProcessPoolExecutor
+import instrumentation
+import json_http
+from instrumentation import instrumented
+
+# Catalogue course codes are interned to small integer IDs (Course.__init__ is the only place
+# that interns), so a student's passed courses can be stored as IDs: a sorted array("I") while
+# that is smaller than a bitmap, a bytearray bitmap (bit i set <=> course ID i) after that.
+# Codes that belong to no course are kept in a per-student side set instead, so arbitrary input
+# never grows the ID space or the bitmaps.
+COURSE_CODE_IDS = {}
+COURSE_CODES = []
+
+def intern_course_code(code):
+    course_id = COURSE_CODE_IDS.get(code)
+    if course_id is None:
+        course_id = len(COURSE_CODES)
+        COURSE_CODE_IDS[code] = course_id
+        COURSE_CODES.append(code)
+    return course_id
+
+def bitmap_add(bitmap, course_id):
+    index = course_id >> 3
+    if index >= len(bitmap):
+        bitmap.extend(bytes(index + 1 - len(bitmap)))
+    bitmap[index] |= 1 << (course_id & 7)
+
+def bitmap_contains(bitmap, course_id):
+    index = course_id >> 3
+    return index < len(bitmap) and (bitmap[index] >> (course_id & 7)) & 1 == 1
+
+def bitmap_to_codes(bitmap):
+    codes = []
+    bits = int.from_bytes(bitmap, "little")
+    while bits:
+        lowest = bits & -bits
+        codes.append(COURSE_CODES[lowest.bit_length() - 1])
+        bits ^= lowest
+    return codes
+
+def id_set_add(ids, course_id):
+    # Returns the container to keep, which becomes a bitmap once 4 bytes per ID outgrow it.
+    if type(ids) is bytearray:
+        bitmap_add(ids, course_id)
+        return ids
+    index = bisect.bisect_left(ids, course_id)
+    if index < len(ids) and ids[index] == course_id:
+        return ids
+    ids.insert(index, course_id)
+    if 4 * len(ids) <= (ids[-1] >> 3) + 1:
+        return ids
+    bitmap = bytearray((ids[-1] >> 3) + 1)
+    for course_id in ids:
+        bitmap[course_id >> 3] |= 1 << (course_id & 7)
+    return bitmap
+
+def id_set_contains(ids, course_id):
+    if type(ids) is bytearray:
+        return bitmap_contains(ids, course_id)
+    index = bisect.bisect_left(ids, course_id)
+    return index < len(ids) and ids[index] == course_id
+
+def id_set_to_codes(ids):
+    if type(ids) is bytearray:
+        return bitmap_to_codes(ids)
+    return [COURSE_CODES[course_id] for course_id in ids]
+
 
 class Course:
+    __slots__ = ("code", "course_id", "name", "credit_hours", "lecture_hours", "practical_hours", "semester", "course_type", "prerequisites")
+
     def __init__(self, code, name, credit_hours, lecture_hours, practical_hours, semester, course_type, prerequisites=None):
         self.code = code
+        self.course_id = intern_course_code(code)
         self.name = name
         self.credit_hours = credit_hours
         self.lecture_hours = lecture_hours
         self.practical_hours = practical_hours
         self.semester = semester
         self.course_type = course_type
-        self.prerequisites = prerequisites if prerequisites is not None else []
+        # A tuple, and the shared empty tuple for the many courses without prerequisites.
+        self.prerequisites = tuple(prerequisites) if prerequisites else ()
 
     def add_prerequisite(self, prerequisite):
-        self.prerequisites.append(prerequisite)
+        self.prerequisites += (prerequisite,)
+
+    def __reduce__(self):
+        # Course IDs are only meaningful inside one process, so pickles carry the codes.
+        return (Course, (self.code, self.name, self.credit_hours, self.lecture_hours, self.practical_hours, self.semester, self.course_type, self.prerequisites))
 
 
 class Student:
+    __slots__ = ("semester", "cgpa", "_passed", "_failed", "_unknown_passed", "_unknown_failed", "_registered", "_registered_credit_hours")
+
     def __init__(self):
         self.semester = 0
         self.cgpa = 0.0
-        self.passed_courses = []
-        self.failed_courses = []
-        self.registered_courses = []
+        self._passed = array("I")
+        self._failed = ()
+        # Codes of courses not in the catalogue, and registrations; None until first needed.
+        self._unknown_passed = None
+        self._unknown_failed = None
+        self._registered = None
+        self._registered_credit_hours = 0
+
+    @property
+    def passed_courses(self):
+        codes = id_set_to_codes(self._passed)
+        if self._unknown_passed is not None:
+            codes.extend(self._unknown_passed)
+        return codes
+
+    @passed_courses.setter
+    def passed_courses(self, course_codes):
+        self._passed = array("I")
+        self._unknown_passed = None
+        for course_code in course_codes:
+            self.add_passed_course(course_code)
+
+    @property
+    def failed_courses(self):
+        codes = [COURSE_CODES[course_id] for course_id in self._failed]
+        if self._unknown_failed is not None:
+            codes.extend(self._unknown_failed)
+        return codes
+
+    @failed_courses.setter
+    def failed_courses(self, course_codes):
+        self._failed = ()
+        self._unknown_failed = None
+        for course_code in course_codes:
+            self.add_failed_course(course_code)
+
+    @property
+    def registered_courses(self):
+        return [] if self._registered is None else list(self._registered.values())
 
     def set_semester(self, semester):
         self.semester = semester
@@ -32,19 +160,60 @@ class Student:
         self.cgpa = cgpa
 
     def add_passed_course(self, course_code):
-        self.passed_courses.append(course_code)
+        course_id = COURSE_CODE_IDS.get(course_code)
+        if course_id is not None:
+            self._passed = id_set_add(self._passed, course_id)
+        elif self._unknown_passed is None:
+            self._unknown_passed = {course_code}
+        else:
+            self._unknown_passed.add(course_code)
 
     def add_failed_course(self, course_code):
-        self.failed_courses.append(course_code)
+        course_id = COURSE_CODE_IDS.get(course_code)
+        if course_id is not None:
+            if course_id not in self._failed:
+                self._failed += (course_id,)
+        elif self._unknown_failed is None:
+            self._unknown_failed = {course_code}
+        else:
+            self._unknown_failed.add(course_code)
+
+    def has_passed(self, course_code):
+        # A code can be interned after it was recorded as unknown, so both places are checked.
+        # id_set_contains is inlined here because can_register_for_course calls this per prerequisite.
+        course_id = COURSE_CODE_IDS.get(course_code)
+        if course_id is not None:
+            passed = self._passed
+            if type(passed) is bytearray:
+                index = course_id >> 3
+                if index < len(passed) and (passed[index] >> (course_id & 7)) & 1:
+                    return True
+            else:
+                index = bisect.bisect_left(passed, course_id)
+                if index < len(passed) and passed[index] == course_id:
+                    return True
+        return self._unknown_passed is not None and course_code in self._unknown_passed
+
+    def has_failed(self, course_code):
+        course_id = COURSE_CODE_IDS.get(course_code)
+        if course_id is not None and course_id in self._failed:
+            return True
+        return self._unknown_failed is not None and course_code in self._unknown_failed
+
+    def is_enrolled(self, course_code):
+        return self._registered is not None and COURSE_CODE_IDS.get(course_code) in self._registered
+
+    def registered_credit_hours(self):
+        return self._registered_credit_hours
 
     def can_register_for_course(self, course):
         if course.semester > self.semester:
             return "You cannot register for this course because it is offered in a higher semester than your current semester."
-        if any(prerequisite not in self.passed_courses for prerequisite in course.prerequisites):
-            missing_prerequisites = [prerequisite for prerequisite in course.prerequisites if prerequisite not in self.passed_courses]
+        missing_prerequisites = [prerequisite for prerequisite in course.prerequisites if not self.has_passed(prerequisite)]
+        if missing_prerequisites:
             return f"You cannot register for this course because you have not passed the following prerequisite(s): {', '.join(missing_prerequisites)}"
         max_credit_hours = self.max_credit_hours()
-        if course.credit_hours + sum(course.credit_hours for course in self.registered_courses) > max_credit_hours:
+        if course.credit_hours + self._registered_credit_hours > max_credit_hours:
             return f"You cannot register for this course because it would exceed the maximum credit hour limit of {max_credit_hours} credit hours per semester."
         return None
 
@@ -52,22 +221,44 @@ class Student:
         registration_status = self.can_register_for_course(course)
         if registration_status:
             return registration_status
-        elif course.code in [c.code for c in self.registered_courses]:
+        elif self._registered is not None and course.course_id in self._registered:
             return "You are already enrolled in this course."
         else:
-            self.registered_courses.append(course)
+            if self._registered is None:
+                self._registered = {}
+            self._registered[course.course_id] = course
+            self._registered_credit_hours += course.credit_hours
             return f"Enrolled in course: {course.name}"
 
     def drop_course(self, course_code):
-        for course in self.registered_courses:
-            if course.code == course_code:
-                self.registered_courses.remove(course)
-                return f"Dropped course: {course.name}"
+        course = None if self._registered is None else self._registered.pop(COURSE_CODE_IDS.get(course_code), None)
+        if course is not None:
+            self._registered_credit_hours -= course.credit_hours
+            return f"Dropped course: {course.name}"
         return "Course not found in registered courses."
 
     def view_enrolled_courses(self):
         return self.registered_courses
 
+    def restore_enrollment(self, course):
+        # Re-attach a stored enrollment without re-checking registration rules.
+        if self._registered is None:
+            self._registered = {}
+        if course.course_id not in self._registered:
+            self._registered[course.course_id] = course
+            self._registered_credit_hours += course.credit_hours
+
+    def __getstate__(self):
+        return (self.semester, self.cgpa, self.passed_courses, self.failed_courses, self.registered_courses)
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.semester, self.cgpa, passed_courses, failed_courses, registered_courses = state
+        self.passed_courses = passed_courses
+        self.failed_courses = failed_courses
+        for course in registered_courses:
+            self.restore_enrollment(course)
+
     def max_credit_hours(self):
         if self.cgpa < 1.67:
             return 13  # Half load
@@ -77,12 +268,96 @@ class Student:
             return 22  # Overload
 
 
+REQUIRED_COURSE_TYPES = ("Core", "Compulsory", "Required", "Mandatory")
+RETAKE_BONUS = 10
+UNLOCK_BONUS = 1
+REQUIRED_BONUS = 3
+
+def prune_dominated_candidates(candidates, credit_hours, top_k):
+    # A schedule holds at most credit_hours // w courses of w credit hours, so any course ranked
+    # below (credit_hours // w + top_k - 1) among courses of the same weight can always be swapped
+    # for a better one and never appears in the top-k schedules.
+    by_weight = {}
+    for index, candidate in enumerate(candidates):
+        by_weight.setdefault(candidate[1], []).append((candidate[0], -index))
+    kept = set()
+    for weight, ranked in by_weight.items():
+        limit = len(ranked) if weight == 0 else credit_hours // weight + top_k - 1
+        kept.update(-index for _, index in heapq.nlargest(limit, ranked))
+    return [candidate for index, candidate in enumerate(candidates) if index in kept]
+
+@lru_cache(maxsize=4096)
+def best_schedules(candidates, credit_hours, top_k):
+    # Top-k 0/1 knapsack over (value, credit_hours, code) candidates. table[c] holds the best
+    # schedules using at most c credit hours and is rebuilt on every call, one candidate at a
+    # time. lru_cache memoizes whole calls only, so students whose candidate tuple and credit
+    # hours are identical share a result.
+    table = [[(0, ())] for _ in range(credit_hours + 1)]
+    for value, course_credit_hours, code in reversed(candidates):
+        updated = list(table)
+        for remaining in range(course_credit_hours, credit_hours + 1):
+            # Both lists are sorted best-first, so merging their heads is enough.
+            skipped, taken = table[remaining], table[remaining - course_credit_hours]
+            merged = []
+            i = j = 0
+            while len(merged) < top_k and (i < len(skipped) or j < len(taken)):
+                if j == len(taken) or (i < len(skipped) and skipped[i][0] >= taken[j][0] + value):
+                    merged.append(skipped[i])
+                    i += 1
+                else:
+                    merged.append((taken[j][0] + value, (code,) + taken[j][1]))
+                    j += 1
+            updated[remaining] = merged
+        table = updated
+    return [schedule for schedule in table[credit_hours] if schedule[1]]
+
+
 class KnowledgeBase:
     def __init__(self):
         self.courses = {}
+        # Prerequisite DAG, kept up to date by add_course/delete_course/add_prerequisite.
+        # prerequisite_graph maps a course code to the codes it requires, dependent_graph
+        # maps a code to the courses that require it (codes may be referenced before they are added).
+        self.prerequisite_graph = {}
+        self.dependent_graph = {}
+        self.semester_index = {}
+        # Courses without prerequisites by semester; with dependent_graph this gives every course
+        # a student could take without scanning the whole catalogue.
+        self.entry_index = {}
+        self._closure_cache = {}
+        self._unlock_count_cache = {}
+        self._topological_position = {}
+        self._next_position = 0
 
     def add_course(self, course):
+        prerequisites = set(course.prerequisites)
+        for prerequisite in prerequisites:
+            if prerequisite == course.code or course.code in self.prerequisite_closure(prerequisite):
+                raise ValueError(f"Adding {course.code} would create a prerequisite cycle through {prerequisite}.")
+
+        if course.code in self.courses:
+            self._unlink_course(course.code)
         self.courses[course.code] = course
+        self.prerequisite_graph[course.code] = set()
+        self.semester_index.setdefault(course.semester, set()).add(course.code)
+        if not prerequisites:
+            self.entry_index.setdefault(course.semester, set()).add(course.code)
+        self._add_node(course.code)
+        for prerequisite in prerequisites:
+            self._link(prerequisite, course.code)
+
+    def add_prerequisite(self, course_code, prerequisite_code):
+        course = self.courses.get(course_code)
+        if course is None or prerequisite_code not in self.courses:
+            return "Course or prerequisite not found."
+        if prerequisite_code in self.prerequisite_graph[course_code]:
+            return f"'{prerequisite_code}' is already a prerequisite of '{course_code}'."
+        if prerequisite_code == course_code or course_code in self.prerequisite_closure(prerequisite_code):
+            return f"'{prerequisite_code}' cannot be a prerequisite of '{course_code}' because it would create a cycle."
+        course.add_prerequisite(prerequisite_code)
+        self.entry_index.get(course.semester, set()).discard(course_code)
+        self._link(prerequisite_code, course_code)
+        return None
 
     def get_course_by_code(self, code):
         return self.courses.get(code)
@@ -90,24 +365,754 @@ class KnowledgeBase:
     def get_all_course_codes(self):
         return list(self.courses.keys())
 
+    def prerequisite_closure(self, code):
+        # All direct and indirect prerequisites of a course, cached per code.
+        if code in self._closure_cache:
+            return self._closure_cache[code]
+        stack = [code]
+        while stack:
+            current = stack[-1]
+            pending = [p for p in self.prerequisite_graph.get(current, ()) if p not in self._closure_cache]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if current in self._closure_cache:
+                continue
+            closure = set()
+            for prerequisite in self.prerequisite_graph.get(current, ()):
+                closure.add(prerequisite)
+                closure |= self._closure_cache[prerequisite]
+            self._closure_cache[current] = frozenset(closure)
+        return self._closure_cache[code]
+
+    def topological_order(self):
+        return sorted(self._topological_position, key=self._topological_position.get)
+
+    def courses_offered_up_to(self, semester):
+        offered = set()
+        for course_semester, codes in self.semester_index.items():
+            if course_semester <= semester:
+                offered |= codes
+        return offered
+
+    @instrumented("knowledge_base.advise_courses", items=lambda result, self, student: len(result))
     def advise_courses(self, student):
+        # A course is eligible only if it has no prerequisites or the student passed one of them,
+        # so the candidates are the entry courses plus the dependents of passed courses.
+        passed_courses_set = set(student.passed_courses)
         failed_courses_set = set(student.failed_courses)
-        eligible_courses = [course for course in self.courses.values() if course.semester <= student.semester and course.code not in student.passed_courses]
-        advised_courses = sorted(eligible_courses, key=lambda course: course.code in failed_courses_set, reverse=True)
-        return advised_courses
+        semester = student.semester
+        candidates = set()
+        for course_semester, codes in self.entry_index.items():
+            if course_semester <= semester:
+                candidates |= codes
+        for code in passed_courses_set:
+            candidates |= self.dependent_graph.get(code, set())
+        eligible_codes = [
+            code for code in candidates
+            if code not in passed_courses_set and self.courses[code].semester <= semester and self.prerequisite_graph[code] <= passed_courses_set
+        ]
+        eligible_codes.sort(key=self._topological_position.__getitem__)
+        courses = self.courses
+        return [courses[code] for code in eligible_codes if code in failed_courses_set] + [courses[code] for code in eligible_codes if code not in failed_courses_set]
+
+    def unlock_count(self, code):
+        # Number of courses that directly or indirectly require this one.
+        if code not in self._unlock_count_cache:
+            self._unlock_count_cache[code] = len(self._descendants(code)) - 1
+        return self._unlock_count_cache[code]
+
+    @instrumented("knowledge_base.recommend_schedules")
+    def recommend_schedules(self, student, top_k=3, required_types=REQUIRED_COURSE_TYPES):
+        # Picks the highest-value sets of advised courses that fit in the student's remaining
+        # credit hours. Retakes, courses that unlock many others and required types score higher.
+        remaining_credit_hours = int(student.max_credit_hours() - student.registered_credit_hours())
+        failed_courses_set = set(student.failed_courses)
+        candidates = []
+        for course in self.advise_courses(student):
+            if student.is_enrolled(course.code) or course.credit_hours > remaining_credit_hours:
+                continue
+            value = course.credit_hours + UNLOCK_BONUS * self.unlock_count(course.code)
+            if course.code in failed_courses_set:
+                value += RETAKE_BONUS
+            if course.course_type in required_types:
+                value += REQUIRED_BONUS
+            candidates.append((value, int(course.credit_hours), course.code))
+        candidates = prune_dominated_candidates(candidates, remaining_credit_hours, top_k)
+        schedules = best_schedules(tuple(candidates), max(remaining_credit_hours, 0), top_k)
+        return [(value, [self.courses[code] for code in codes]) for value, codes in schedules]
 
     def delete_course(self, code):
         if code in self.courses:
+            self._unlink_course(code)
             del self.courses[code]
+            del self.prerequisite_graph[code]
+            if not self.dependent_graph.get(code):
+                self.dependent_graph.pop(code, None)
+                self._topological_position.pop(code, None)
             return f"Course {code} deleted successfully."
         else:
             return "Course not found."
 
+    def _add_node(self, code):
+        if code not in self._topological_position:
+            self._topological_position[code] = self._next_position
+            self._next_position += 1
+
+    def _descendants(self, code):
+        seen = {code}
+        stack = [code]
+        while stack:
+            for dependent in self.dependent_graph.get(stack.pop(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return seen
+
+    def _link(self, prerequisite, code):
+        self._add_node(prerequisite)
+        self.prerequisite_graph[code].add(prerequisite)
+        self.dependent_graph.setdefault(prerequisite, set()).add(code)
+        self._reorder(prerequisite, code)
+
+        # Extend cached closures downstream instead of recomputing them.
+        gained = self.prerequisite_closure(prerequisite) | {prerequisite}
+        for ancestor in gained:
+            self._unlock_count_cache.pop(ancestor, None)
+        for descendant in self._descendants(code):
+            if descendant in self._closure_cache:
+                self._closure_cache[descendant] = self._closure_cache[descendant] | gained
+
+    def _unlink_course(self, code):
+        for ancestor in self.prerequisite_closure(code):
+            self._unlock_count_cache.pop(ancestor, None)
+        for prerequisite in self.prerequisite_graph[code]:
+            dependents = self.dependent_graph[prerequisite]
+            dependents.discard(code)
+            if not dependents and prerequisite not in self.courses:
+                del self.dependent_graph[prerequisite]
+                del self._topological_position[prerequisite]
+        self.prerequisite_graph[code] = set()
+        self.semester_index[self.courses[code].semester].discard(code)
+        self.entry_index.get(self.courses[code].semester, set()).discard(code)
+        for descendant in self._descendants(code):
+            self._closure_cache.pop(descendant, None)
+
+    def _reorder(self, prerequisite, code):
+        # Pearce-Kelly: only the nodes between the two positions are shifted.
+        position = self._topological_position
+        lower, upper = position[code], position[prerequisite]
+        if upper < lower:
+            return
+        forward = self._affected(code, self.dependent_graph, lambda node: position[node] <= upper)
+        backward = self._affected(prerequisite, self.prerequisite_graph, lambda node: position[node] >= lower)
+        slots = sorted(position[node] for node in forward + backward)
+        nodes = sorted(backward, key=position.get) + sorted(forward, key=position.get)
+        for node, slot in zip(nodes, slots):
+            position[node] = slot
+
+    def _affected(self, start, graph, in_range):
+        seen = {start}
+        stack = [start]
+        while stack:
+            for neighbour in graph.get(stack.pop(), ()):
+                if neighbour not in seen and in_range(neighbour):
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        return list(seen)
+
+
+class BatchAdvisor:
+    # Advises a whole cohort at once. Rows of every matrix are students and columns are the
+    # prerequisite graph's nodes in topological order, so eligibility is a single matrix product.
+    # The prerequisite matrix is sparse (one entry per edge), so that product costs
+    # students x edges rather than students x courses^2, and so does pickling it to workers.
+    def __init__(self, knowledge_base):
+        self.codes = knowledge_base.topological_order()
+        self.column = {code: index for index, code in enumerate(self.codes)}
+        courses = [knowledge_base.courses.get(code) for code in self.codes]
+        self.is_course = np.array([course is not None for course in courses], dtype=bool)
+        self.semesters = np.array([np.inf if course is None else course.semester for course in courses], dtype=float)
+        rows = []
+        columns = []
+        for code, prerequisites in knowledge_base.prerequisite_graph.items():
+            for prerequisite in prerequisites:
+                rows.append(self.column[prerequisite])
+                columns.append(self.column[code])
+        # prerequisites[p, c] is 1 when course c requires p.
+        self.prerequisites = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)), shape=(len(self.codes), len(self.codes)))
+
+    def eligibility_matrix(self, students):
+        semesters = np.asarray(students["semester"], dtype=float)
+        passed = self._encode(students["passed_courses"])
+        missing_prerequisites = np.asarray((~passed).astype(np.float32) @ self.prerequisites)
+        offered = self.semesters[np.newaxis, :] <= semesters[:, np.newaxis]
+        return self.is_course & offered & ~passed & (missing_prerequisites == 0)
+
+    @instrumented("batch_advisor.advise", items=lambda result, self, students, *args, **kwargs: len(students))
+    def advise(self, students, workers=1, chunk_size=2048):
+        if workers > 1 and len(students) > chunk_size:
+            chunks = [students.iloc[start:start + chunk_size] for start in range(0, len(students), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(self,)) as executor:
+                return pd.concat(executor.map(_advise_batch_chunk, chunks))
+        return self._advise_rows(students)
+
+    def _advise_rows(self, students):
+        eligible = self.eligibility_matrix(students)
+        failed = self._encode(students["failed_courses"])
+        codes = np.array(self.codes, dtype=object)
+        eligible_courses = []
+        advised_courses = []
+        for row_eligible, row_failed in zip(eligible, failed):
+            eligible_courses.append(codes[row_eligible].tolist())
+            advised_courses.append(codes[row_eligible & row_failed].tolist() + codes[row_eligible & ~row_failed].tolist())
+        cgpa = np.asarray(students["cgpa"], dtype=float)
+        max_credit_hours = np.select([cgpa < 1.67, cgpa < 3.0], [13, 20], default=22)
+        return pd.DataFrame({"eligible_courses": eligible_courses, "advised_courses": advised_courses, "max_credit_hours": max_credit_hours}, index=students.index)
+
+    def _encode(self, course_codes):
+        rows = []
+        columns = []
+        for row, codes in enumerate(course_codes):
+            if isinstance(codes, str):
+                codes = codes.split(",")
+            elif not isinstance(codes, (list, tuple, set, frozenset)):
+                codes = []
+            for code in codes:
+                column = self.column.get(code.strip())
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+        matrix = np.zeros((len(course_codes), len(self.codes)), dtype=bool)
+        matrix[rows, columns] = True
+        return matrix
+
+
+_batch_worker_advisor = None
+
+
+def _init_batch_worker(advisor):
+    global _batch_worker_advisor
+    _batch_worker_advisor = advisor
+
+
+def _advise_batch_chunk(students):
+    return _batch_worker_advisor._advise_rows(students)
+
+
+def course_to_dict(course):
+    return {
+        "code": course.code,
+        "name": course.name,
+        "credit_hours": course.credit_hours,
+        "lecture_hours": course.lecture_hours,
+        "practical_hours": course.practical_hours,
+        "semester": course.semester,
+        "type": course.course_type,
+        "prerequisites": list(course.prerequisites),
+    }
+
+def string_from_dict(data, field, default=None):
+    value = data[field] if default is None else data.get(field, default)
+    if not isinstance(value, str):
+        raise ValueError(f"'{field}' must be a string.")
+    return value
+
+def course_codes_from_dict(data, field):
+    course_codes = data.get(field, [])
+    if not isinstance(course_codes, list) or not all(isinstance(course_code, str) for course_code in course_codes):
+        raise ValueError(f"'{field}' must be a list of course codes.")
+    return course_codes
+
+def student_from_dict(data):
+    student = Student()
+    student.set_semester(int(data["semester"]))
+    student.set_cgpa(float(data["cgpa"]))
+    for course_code in course_codes_from_dict(data, "passed_courses"):
+        student.add_passed_course(course_code)
+    for course_code in course_codes_from_dict(data, "failed_courses"):
+        student.add_failed_course(course_code)
+    return student
+
+
+class AdvisingService:
+    # Headless HTTP/JSON front end for the advising engine, served from one asyncio loop.
+    # Requests read whatever KnowledgeBase self.knowledge_base points at without locking. Catalogue
+    # edits change a copy of the current snapshot and then swap the reference, so a request never
+    # sees a half-applied change and a rejected change (e.g. a prerequisite cycle) leaves no trace.
+    # With a RegistrationStore, students, enrollments and catalogue edits are written to it (an
+    # edit before its snapshot goes live), so they survive restarts and enrollments from other
+    # processes sharing the database count towards the credit-hour limit. Without one, students
+    # live in self.students.
+    def __init__(self, knowledge_base, store=None):
+        self.knowledge_base = knowledge_base
+        self.store = store
+        self.students = {}
+        routes = [
+            ("POST", re.compile(r"/advise"), self.advise),
+            ("PUT", re.compile(r"/students/([^/]+)"), self.put_student),
+            ("GET", re.compile(r"/students/([^/]+)/advice"), self.student_advice),
+            ("GET", re.compile(r"/students/([^/]+)/eligibility/([^/]+)"), self.check_eligibility),
+            ("POST", re.compile(r"/students/([^/]+)/enroll"), self.enroll),
+            ("POST", re.compile(r"/students/([^/]+)/drop"), self.drop),
+            ("GET", re.compile(r"/courses"), self.list_courses),
+            ("POST", re.compile(r"/courses"), self.add_course),
+            ("DELETE", re.compile(r"/courses/([^/]+)"), self.delete_course),
+            ("POST", re.compile(r"/courses/([^/]+)/prerequisites"), self.add_prerequisite),
+            ("GET", re.compile(r"/metrics"), self.metrics),
+        ]
+        # Each route is timed under its own name (service.enroll, service.check_eligibility, ...),
+        # on top of service.dispatch for every request.
+        self.routes = [(method, pattern, handler, f"service.{handler.__name__}") for method, pattern, handler in routes]
+
+    def advice_for(self, student):
+        knowledge_base = self.knowledge_base
+        schedules = knowledge_base.recommend_schedules(student)
+        return {
+            "max_credit_hours": student.max_credit_hours(),
+            "registered_credit_hours": student.registered_credit_hours(),
+            "advised_courses": [course.code for course in knowledge_base.advise_courses(student)],
+            "recommended_schedules": [{"value": value, "courses": [course.code for course in courses]} for value, courses in schedules],
+        }
+
+    def advise(self, body):
+        return 200, self.advice_for(student_from_dict(body))
+
+    def get_student(self, student_id):
+        if self.store is not None:
+            return self.store.get_student(student_id, self.knowledge_base)
+        return self.students.get(student_id)
+
+    def put_student(self, body, student_id):
+        student = student_from_dict(body)
+        if self.store is not None:
+            self.store.save_student(student_id, student)
+        else:
+            self.students[student_id] = student
+        return 201, {"student": student_id}
+
+    def student_advice(self, body, student_id):
+        student = self.get_student(student_id)
+        if student is None:
+            return 404, {"error": "Student not found."}
+        return 200, self.advice_for(student)
+
+    def check_eligibility(self, body, student_id, course_code):
+        student = self.get_student(student_id)
+        course = self.knowledge_base.get_course_by_code(course_code)
+        if student is None or course is None:
+            return 404, {"error": "Student or course not found."}
+        reason = student.can_register_for_course(course)
+        return 200, {"eligible": reason is None, "reason": reason}
+
+    def enroll(self, body, student_id):
+        student = self.get_student(student_id)
+        course = self.knowledge_base.get_course_by_code(body.get("code"))
+        if student is None or course is None:
+            return 404, {"error": "Student or course not found."}
+        if self.store is not None:
+            enrolled, message = self.store.enroll(student_id, course, self.knowledge_base)
+        elif student.is_enrolled(course.code):
+            enrolled, message = False, "You are already enrolled in this course."
+        else:
+            message = student.enroll_course(course)
+            enrolled = student.is_enrolled(course.code)
+        return (200 if enrolled else 409), {"message": message}
+
+    def drop(self, body, student_id):
+        student = self.get_student(student_id)
+        if student is None:
+            return 404, {"error": "Student not found."}
+        course_code = body.get("code")
+        if self.store is not None:
+            dropped, message = self.store.drop(student_id, course_code, self.knowledge_base)
+        else:
+            dropped = student.is_enrolled(course_code)
+            message = student.drop_course(course_code)
+        if not dropped:
+            return 404, {"error": message}
+        return 200, {"message": message}
+
+    def list_courses(self, body):
+        return 200, {"courses": [course_to_dict(course) for course in self.knowledge_base.courses.values()]}
+
+    def add_course(self, body):
+        code = string_from_dict(body, "code")
+        if code in self.knowledge_base.courses:
+            return 409, {"error": f"Course {code} already exists."}
+        course = Course(code, string_from_dict(body, "name"), int(body["credit_hours"]), int(body.get("lecture_hours", 0)), int(body.get("practical_hours", 0)), int(body["semester"]), string_from_dict(body, "type", "Unknown"), course_codes_from_dict(body, "prerequisites"))
+        knowledge_base = copy.deepcopy(self.knowledge_base)
+        knowledge_base.add_course(course)
+        self._publish(knowledge_base, lambda store: store.save_courses([course]))
+        return 201, course_to_dict(course)
+
+    def delete_course(self, body, course_code):
+        if course_code not in self.knowledge_base.courses:
+            return 404, {"error": "Course not found."}
+        knowledge_base = copy.deepcopy(self.knowledge_base)
+        message = knowledge_base.delete_course(course_code)
+        self._publish(knowledge_base, lambda store: store.delete_course(course_code))
+        return 200, {"message": message}
+
+    def add_prerequisite(self, body, course_code):
+        prerequisite_code = string_from_dict(body, "prerequisite")
+        if course_code not in self.knowledge_base.courses or prerequisite_code not in self.knowledge_base.courses:
+            return 404, {"error": "Course or prerequisite not found."}
+        knowledge_base = copy.deepcopy(self.knowledge_base)
+        error = knowledge_base.add_prerequisite(course_code, prerequisite_code)
+        if error is not None:
+            return 409, {"error": error}
+        self._publish(knowledge_base, lambda store: store.add_prerequisite(course_code, prerequisite_code))
+        return 200, {"message": f"Prerequisite '{prerequisite_code}' added for course '{course_code}' successfully."}
+
+    def _publish(self, knowledge_base, persist):
+        # Swaps in an edited copy. The store is written first, so a failed write leaves both as they were.
+        if self.store is not None:
+            persist(self.store)
+        self.knowledge_base = knowledge_base
+
+    def metrics(self, body):
+        # Prometheus text exposition; empty unless the service runs with --instrument.
+        return 200, instrumentation.REGISTRY.to_prometheus()
+
+    @instrumented("service.dispatch")
+    def dispatch(self, method, path, body):
+        if not isinstance(body, dict):
+            return 400, {"error": "Request body must be a JSON object."}
+        path_matched = False
+        for route_method, pattern, handler, metric in self.routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            path_matched = True
+            if route_method != method:
+                continue
+            try:
+                with instrumentation.span(metric):
+                    return handler(body, *match.groups())
+            except KeyError as error:
+                return 400, {"error": f"Missing field {error}."}
+            except (TypeError, ValueError) as error:
+                return 400, {"error": str(error)}
+            except Exception:
+                return 500, {"error": "Internal server error."}
+        if path_matched:
+            return 405, {"error": "Method not allowed."}
+        return 404, {"error": "Not found."}
+
+    async def handle(self, method, path, body):
+        return self.dispatch(method, path, body)
+
+    async def handle_connection(self, reader, writer):
+        await json_http.serve_connection(reader, writer, self.handle)
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    credit_hours INTEGER NOT NULL,
+    lecture_hours INTEGER NOT NULL,
+    practical_hours INTEGER NOT NULL,
+    semester INTEGER NOT NULL,
+    course_type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prerequisites (
+    course_code TEXT NOT NULL,
+    prerequisite_code TEXT NOT NULL,
+    UNIQUE (course_code, prerequisite_code)
+);
+CREATE INDEX IF NOT EXISTS prerequisites_by_prerequisite ON prerequisites (prerequisite_code);
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    semester INTEGER NOT NULL,
+    cgpa REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS student_results (
+    student_id TEXT NOT NULL REFERENCES students (student_id) ON DELETE CASCADE,
+    course_code TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    UNIQUE (student_id, course_code, passed)
+);
+CREATE TABLE IF NOT EXISTS enrollments (
+    student_id TEXT NOT NULL REFERENCES students (student_id) ON DELETE CASCADE,
+    course_code TEXT NOT NULL,
+    credit_hours INTEGER NOT NULL,
+    PRIMARY KEY (student_id, course_code)
+);
+"""
+
+
+class RegistrationStore:
+    # SQLite persistence for the catalogue, students and enrollments. Students are read on first
+    # use rather than at startup. Enroll and drop run in BEGIN IMMEDIATE transactions, so two
+    # registrations for the same student (even from different processes) cannot both pass the
+    # credit-hour check.
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, isolation_level=None, cached_statements=256)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(STORE_SCHEMA)
+        self._students = {}
+
+    @contextmanager
+    def transaction(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    def close(self):
+        self.connection.close()
+
+    def has_courses(self):
+        return self.connection.execute("SELECT 1 FROM courses LIMIT 1").fetchone() is not None
+
+    def save_courses(self, courses):
+        with self.transaction() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO courses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((course.code, course.name, course.credit_hours, course.lecture_hours, course.practical_hours, course.semester, course.course_type) for course in courses),
+            )
+            connection.executemany("DELETE FROM prerequisites WHERE course_code = ?", ((course.code,) for course in courses))
+            connection.executemany(
+                "INSERT OR IGNORE INTO prerequisites VALUES (?, ?)",
+                ((course.code, prerequisite) for course in courses for prerequisite in course.prerequisites),
+            )
+
+    def add_prerequisite(self, course_code, prerequisite_code):
+        with self.transaction() as connection:
+            connection.execute("INSERT OR IGNORE INTO prerequisites VALUES (?, ?)", (course_code, prerequisite_code))
+
+    def delete_course(self, code):
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM courses WHERE code = ?", (code,))
+            connection.execute("DELETE FROM prerequisites WHERE course_code = ?", (code,))
+
+    def load_knowledge_base(self):
+        prerequisites = {}
+        for course_code, prerequisite_code in self.connection.execute("SELECT course_code, prerequisite_code FROM prerequisites ORDER BY rowid"):
+            prerequisites.setdefault(course_code, []).append(prerequisite_code)
+        knowledge_base = KnowledgeBase()
+        for code, name, credit_hours, lecture_hours, practical_hours, semester, course_type in self.connection.execute("SELECT * FROM courses ORDER BY rowid"):
+            knowledge_base.add_course(Course(code, name, credit_hours, lecture_hours, practical_hours, semester, course_type, prerequisites.get(code, [])))
+        return knowledge_base
+
+    def save_student(self, student_id, student):
+        with self.transaction() as connection:
+            connection.execute(
+                "INSERT INTO students VALUES (?, ?, ?) ON CONFLICT (student_id) DO UPDATE SET semester = excluded.semester, cgpa = excluded.cgpa",
+                (student_id, student.semester, student.cgpa),
+            )
+            connection.execute("DELETE FROM student_results WHERE student_id = ?", (student_id,))
+            connection.executemany(
+                "INSERT OR IGNORE INTO student_results VALUES (?, ?, ?)",
+                [(student_id, code, 1) for code in student.passed_courses] + [(student_id, code, 0) for code in student.failed_courses],
+            )
+        self._students.pop(student_id, None)
+
+    def get_student(self, student_id, knowledge_base):
+        if student_id not in self._students:
+            student = self._read_student(self.connection, student_id, knowledge_base)
+            if student is None:
+                return None
+            self._students[student_id] = student
+        return self._students[student_id]
+
+    def enroll(self, student_id, course, knowledge_base):
+        # Returns (enrolled, message); enrolled is False when the registration was rejected.
+        with self.transaction() as connection:
+            # Re-read inside the write transaction so enrollments made by other connections count.
+            student = self._read_student(connection, student_id, knowledge_base)
+            if student is None:
+                return False, "Student not found."
+            enrolled = not student.is_enrolled(course.code)
+            message = student.enroll_course(course)
+            enrolled = enrolled and student.is_enrolled(course.code)
+            if enrolled:
+                connection.execute("INSERT INTO enrollments VALUES (?, ?, ?)", (student_id, course.code, course.credit_hours))
+        self._students[student_id] = student
+        return enrolled, message
+
+    def drop(self, student_id, course_code, knowledge_base):
+        # Returns (dropped, message); dropped is False when the course was not registered.
+        with self.transaction() as connection:
+            student = self._read_student(connection, student_id, knowledge_base)
+            if student is None:
+                return False, "Student not found."
+            dropped = student.is_enrolled(course_code)
+            message = student.drop_course(course_code)
+            connection.execute("DELETE FROM enrollments WHERE student_id = ? AND course_code = ?", (student_id, course_code))
+        self._students[student_id] = student
+        return dropped, message
+
+    def _read_student(self, connection, student_id, knowledge_base):
+        row = connection.execute("SELECT semester, cgpa FROM students WHERE student_id = ?", (student_id,)).fetchone()
+        if row is None:
+            return None
+        student = Student()
+        student.set_semester(row[0])
+        student.set_cgpa(row[1])
+        for course_code, passed in connection.execute("SELECT course_code, passed FROM student_results WHERE student_id = ? ORDER BY rowid", (student_id,)):
+            if passed:
+                student.add_passed_course(course_code)
+            else:
+                student.add_failed_course(course_code)
+        for course_code, credit_hours in connection.execute("SELECT course_code, credit_hours FROM enrollments WHERE student_id = ? ORDER BY rowid", (student_id,)):
+            course = knowledge_base.get_course_by_code(course_code)
+            if course is None:
+                # The course was removed from the catalogue after enrolment; keep counting its hours.
+                course = Course(course_code, course_code, credit_hours, 0, 0, 0, "Unknown")
+            student.restore_enrollment(course)
+        return student
+
+
+class CoursePrefixIndex:
+    # Sorted (key, code) pairs over each course's code, full name and name words, so a
+    # search prefix maps to one contiguous slice found by bisection.
+    def __init__(self, courses):
+        entries = set()
+        for course in courses:
+            name = str(course.name).lower()
+            entries.add((str(course.code).lower(), course.code))
+            entries.add((name, course.code))
+            for word in name.split():
+                entries.add((word, course.code))
+        entries = sorted(entries)
+        self.keys = [key for key, _ in entries]
+        self.codes = [code for _, code in entries]
+
+    def search(self, prefix):
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return None
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_right(self.keys, prefix + "\U0010ffff")
+        return set(self.codes[start:end])
+
+
+class VirtualList(tk.Frame):
+    # Scrollable list that only creates labels for the rows that fit on screen and reuses them
+    # while scrolling; a refresh reconfigures just the labels whose text changed.
+    def __init__(self, master, bg='#e0f7fa', fg='#00796b', font=("Helvetica", 12)):
+        super().__init__(master, bg=bg)
+        self.label_options = {"bg": bg, "fg": fg, "font": font, "anchor": "w"}
+        self.row_height = tkfont.Font(font=font).metrics("linespace") + 4
+        self.items = []
+        self.first = 0
+        self.rows = []
+        self.shown = []
+
+        self.scrollbar = Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        # The body keeps its own size so that adding rows cannot grow it and trigger another resize.
+        self.body = tk.Frame(self, bg=bg, height=240)
+        self.body.pack_propagate(False)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", self._resize)
+        self._bind_wheel(self.body)
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.first = max(0, min(self.first, len(self.items) - len(self.rows)))
+        self._render()
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.first += step * max(1, len(self.rows) - 1) if args[2] == "pages" else step
+        self.first = max(0, min(self.first, len(self.items) - len(self.rows)))
+        self._render()
+
+    def _resize(self, event):
+        count = max(1, event.height // self.row_height)
+        while len(self.rows) < count:
+            label = tk.Label(self.body, text="", **self.label_options)
+            label.pack(fill="x")
+            self._bind_wheel(label)
+            self.rows.append(label)
+            self.shown.append("")
+        while len(self.rows) > count:
+            self.rows.pop().destroy()
+            self.shown.pop()
+        self.first = max(0, min(self.first, len(self.items) - len(self.rows)))
+        self._render()
+
+    def _render(self):
+        for offset, label in enumerate(self.rows):
+            index = self.first + offset
+            text = self.items[index] if index < len(self.items) else ""
+            if self.shown[offset] != text:
+                label.configure(text=text)
+                self.shown[offset] = text
+        total = max(len(self.items), 1)
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + len(self.rows)) / total))
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda event: self.yview("scroll", -1 if event.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda event: self.yview("scroll", -1, "units"))
+        widget.bind("<Button-5>", lambda event: self.yview("scroll", 1, "units"))
+
+
+class CourseListView(tk.Frame):
+    # A VirtualList of courses with a search box that filters by code or name prefix as you type.
+    def __init__(self, master, describe, empty_text, bg='#e0f7fa', fg='#00796b'):
+        super().__init__(master, bg=bg)
+        self.describe = describe
+        self.empty_text = empty_text
+        self.descriptions = []
+        self.positions = {}
+        self.index = CoursePrefixIndex([])
+        self.indexed_codes = ()
+
+        search_frame = tk.Frame(self, bg=bg)
+        search_frame.pack(fill="x")
+        tk.Label(search_frame, text="Search:", bg=bg, fg=fg, font=("Helvetica", 12)).pack(side="left")
+        self.search_text = tk.StringVar()
+        self.search_text.trace_add("write", lambda *args: self.apply_filter())
+        tk.Entry(search_frame, textvariable=self.search_text, font=("Helvetica", 12)).pack(side="left", fill="x", expand=True)
+
+        self.list = VirtualList(self, bg=bg, fg=fg)
+        self.list.pack(fill="both", expand=True)
+
+    def set_courses(self, courses):
+        # Descriptions are built once per refresh; a keystroke only picks the matching ones.
+        courses = list(courses)
+        self.descriptions = [self.describe(course) for course in courses]
+        codes = tuple(course.code for course in courses)
+        if codes != self.indexed_codes:
+            self.index = CoursePrefixIndex(courses)
+            self.positions = {code: position for position, code in enumerate(codes)}
+            self.indexed_codes = codes
+        self.apply_filter()
+
+    def apply_filter(self):
+        matches = self.index.search(self.search_text.get())
+        if matches is None:
+            visible = self.descriptions
+        else:
+            visible = [self.descriptions[position] for position in sorted(self.positions[code] for code in matches)]
+        self.list.set_items(visible or [self.empty_text])
+
 
 class AcademicAdvisorApp:
-    def __init__(self, root, knowledge_base):
+    def __init__(self, root, knowledge_base, store=None):
         self.root = root
         self.knowledge_base = knowledge_base
+        self.store = store
+        self.student_id = None
 
         self.root.title("Academic Advisor System")
         self.root.geometry("800x600")
@@ -145,8 +1150,14 @@ class AcademicAdvisorApp:
         self.failed_courses_entry = tk.Entry(self.main_frame, width=50, font=("Helvetica", 12))
         self.failed_courses_entry.grid(row=4, column=1, sticky='w', pady=5)
 
-        tk.Button(self.main_frame, text="Submit", command=self.submit_student_info, bg='#00796b', fg='white', font=("Helvetica", 12)).grid(row=5, column=0, columnspan=2, pady=10)
-        tk.Button(self.main_frame, text="Back to Main Menu", command=self.create_main_menu, bg='#00796b', fg='white', font=("Helvetica", 12)).grid(row=6, column=0, columnspan=2, pady=10)
+        self.student_id_entry = None
+        if self.store is not None:
+            tk.Label(self.main_frame, text="Enter your student ID (to save your registration):", bg='#e0f7fa', fg='#00796b', font=("Helvetica", 12)).grid(row=5, column=0, sticky='e', pady=5)
+            self.student_id_entry = tk.Entry(self.main_frame, font=("Helvetica", 12))
+            self.student_id_entry.grid(row=5, column=1, sticky='w', pady=5)
+
+        tk.Button(self.main_frame, text="Submit", command=self.submit_student_info, bg='#00796b', fg='white', font=("Helvetica", 12)).grid(row=6, column=0, columnspan=2, pady=10)
+        tk.Button(self.main_frame, text="Back to Main Menu", command=self.create_main_menu, bg='#00796b', fg='white', font=("Helvetica", 12)).grid(row=7, column=0, columnspan=2, pady=10)
 
     def submit_student_info(self):
         try:
@@ -165,6 +1176,11 @@ class AcademicAdvisorApp:
             for course_code in failed_courses:
                 self.student.add_failed_course(course_code.strip())
 
+            self.student_id = self.student_id_entry.get().strip() if self.student_id_entry is not None else None
+            if self.student_id:
+                self.store.save_student(self.student_id, self.student)
+                self.student = self.store.get_student(self.student_id, self.knowledge_base)
+
             self.show_advised_courses()
 
         except ValueError:
@@ -173,27 +1189,18 @@ class AcademicAdvisorApp:
     def show_advised_courses(self):
         self.clear_frame(self.main_frame)
         eligible_courses = self.knowledge_base.advise_courses(self.student)
-        remaining_credit_hours = self.student.max_credit_hours() - sum(course.credit_hours for course in self.student.registered_courses)
 
         if eligible_courses:
-            tk.Label(self.main_frame, text=f"You can enroll in {remaining_credit_hours} credit hours.", font=("Helvetica", 14, "bold"), bg='#e0f7fa', fg='#00796b').pack(pady=10)
+            self.remaining_credit_hours_label = tk.Label(self.main_frame, font=("Helvetica", 14, "bold"), bg='#e0f7fa', fg='#00796b')
+            self.remaining_credit_hours_label.pack(pady=10)
+            self.recommended_schedule_label = tk.Label(self.main_frame, font=("Helvetica", 12), bg='#e0f7fa', fg='#00796b')
+            self.recommended_schedule_label.pack(pady=5)
+            self.recommended_schedule_button = tk.Button(self.main_frame, text="Enroll in Recommended Schedule", command=self.enroll_recommended_schedule, bg='#00796b', fg='white', font=("Helvetica", 12))
+            self.recommended_schedule_button.pack(pady=5)
             tk.Label(self.main_frame, text="Advised Courses for Registration:", font=("Helvetica", 14, "bold"), bg='#e0f7fa', fg='#00796b').pack(pady=10)
 
-            # Create a scrollable frame
-            canvas = Canvas(self.main_frame, bg='#e0f7fa')
-            scroll_y = Scrollbar(self.main_frame, orient="vertical", command=canvas.yview)
-            scrollable_frame = tk.Frame(canvas, bg='#e0f7fa')
-
-            scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scroll_y.set)
-
-            for course in eligible_courses:
-                tk.Label(scrollable_frame, text=f"{course.code}: {course.name} - Credit Hours: {course.credit_hours}", bg='#e0f7fa', fg='#00796b', font=("Helvetica", 12)).pack()
-
-            canvas.pack(side="left", fill="both", expand=True)
-            scroll_y.pack(side="right", fill="y")
+            self.advised_course_list = CourseListView(self.main_frame, lambda course: f"{course.code}: {course.name} - Credit Hours: {course.credit_hours}", "No courses advised for the given semester.")
+            self.advised_course_list.pack(fill="both", expand=True)
 
             self.course_code_entry = tk.Entry(self.main_frame, font=("Helvetica", 12))
             self.course_code_entry.pack(pady=5)
@@ -201,51 +1208,74 @@ class AcademicAdvisorApp:
             tk.Button(self.main_frame, text="View Enrolled Courses", command=self.view_enrolled_courses, bg='#00796b', fg='white', font=("Helvetica", 12)).pack(pady=5)
             tk.Button(self.main_frame, text="Drop Course", command=self.drop_course, bg='#00796b', fg='white', font=("Helvetica", 12)).pack(pady=5)
             tk.Button(self.main_frame, text="Back to Main Menu", command=self.create_main_menu, bg='#00796b', fg='white', font=("Helvetica", 12)).pack(pady=5)
+            self.refresh_advised_courses(eligible_courses)
         else:
             tk.Label(self.main_frame, text="No courses advised for the given semester.", font=("Helvetica", 14, "bold"), bg='#e0f7fa', fg='#00796b').pack(pady=10)
             tk.Button(self.main_frame, text="Back to Main Menu", command=self.create_main_menu, bg='#00796b', fg='white', font=("Helvetica", 12)).pack(pady=5)
 
+    def refresh_advised_courses(self, eligible_courses=None):
+        # Updates the advised-courses screen in place after an enroll or drop.
+        if eligible_courses is None:
+            eligible_courses = self.knowledge_base.advise_courses(self.student)
+        remaining_credit_hours = self.student.max_credit_hours() - self.student.registered_credit_hours()
+        self.remaining_credit_hours_label.configure(text=f"You can enroll in {remaining_credit_hours} credit hours.")
+
+        schedules = self.knowledge_base.recommend_schedules(self.student, top_k=1)
+        self.recommended_courses = schedules[0][1] if schedules else []
+        if self.recommended_courses:
+            recommended_codes = ", ".join(course.code for course in self.recommended_courses)
+            self.recommended_schedule_label.configure(text=f"Recommended schedule: {recommended_codes}")
+            self.recommended_schedule_button.configure(state="normal")
+        else:
+            self.recommended_schedule_label.configure(text="No further courses fit in your remaining credit hours.")
+            self.recommended_schedule_button.configure(state="disabled")
+
+        self.advised_course_list.set_courses(eligible_courses)
+
     def enroll_course(self):
         course_code = self.course_code_entry.get().upper()
         course = self.knowledge_base.get_course_by_code(course_code)
         if course:
-            message = self.student.enroll_course(course)
+            message = self.enroll_student(course)
             messagebox.showinfo("Enrollment Status", message)
-            self.show_advised_courses()  # Update advised courses list after enrolling
+            self.refresh_advised_courses()  # Update advised courses list after enrolling
         else:
             messagebox.showerror("Invalid Course", "Course not found.")
 
+    def enroll_recommended_schedule(self):
+        with instrumentation.span("app.enroll_recommended_schedule", len(self.recommended_courses)):
+            messages = [self.enroll_student(course) for course in self.recommended_courses]
+        messagebox.showinfo("Enrollment Status", "\n".join(messages))
+        self.refresh_advised_courses()
+
+    @instrumented("app.enroll_student")
+    def enroll_student(self, course):
+        if self.student_id:
+            _, message = self.store.enroll(self.student_id, course, self.knowledge_base)
+            self.student = self.store.get_student(self.student_id, self.knowledge_base)
+            return message
+        return self.student.enroll_course(course)
+
     def view_enrolled_courses(self):
         enrolled_courses = self.student.view_enrolled_courses()
         self.clear_frame(self.main_frame)
         tk.Label(self.main_frame, text="Enrolled Courses:", font=("Helvetica", 14, "bold"), bg='#e0f7fa', fg='#00796b').pack(pady=10)
 
-        # Create a scrollable frame
-        canvas = Canvas(self.main_frame, bg='#e0f7fa')
-        scroll_y = Scrollbar(self.main_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg='#e0f7fa')
-
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scroll_y.set)
-
-        if enrolled_courses:
-            for course in enrolled_courses:
-                tk.Label(scrollable_frame, text=f"{course.code}: {course.name}", bg='#e0f7fa', fg='#00796b', font=("Helvetica", 12)).pack()
-        else:
-            tk.Label(scrollable_frame, text="No courses enrolled.", bg='#e0f7fa', fg='#00796b', font=("Helvetica", 12)).pack()
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scroll_y.pack(side="right", fill="y")
+        course_list = CourseListView(self.main_frame, lambda course: f"{course.code}: {course.name}", "No courses enrolled.")
+        course_list.pack(fill="both", expand=True)
+        course_list.set_courses(enrolled_courses)
 
         tk.Button(self.main_frame, text="Back to Main Menu", command=self.create_main_menu, bg='#00796b', fg='white', font=("Helvetica", 12)).pack(pady=5)
 
     def drop_course(self):
         course_code = self.course_code_entry.get().upper()
-        message = self.student.drop_course(course_code)
+        if self.student_id:
+            _, message = self.store.drop(self.student_id, course_code, self.knowledge_base)
+            self.student = self.store.get_student(self.student_id, self.knowledge_base)
+        else:
+            message = self.student.drop_course(course_code)
         messagebox.showinfo("Drop Course Status", message)
-        self.show_advised_courses()  # Update advised courses list after dropping
+        self.refresh_advised_courses()  # Update advised courses list after dropping
 
     def advisor_portal(self):
         self.clear_frame(self.main_frame)
@@ -274,17 +1304,23 @@ class AcademicAdvisorApp:
         tk.Button(self.main_frame, text="Back to Main Menu", command=self.create_main_menu, bg='#00796b', fg='white', font=("Helvetica", 12)).pack(pady=10)
 
     def save_new_course(self):
-        code = self.course_entries["Code"].get()
-        name = self.course_entries["Name"].get()
-        credit_hours = int(self.course_entries["Credit Hours"].get())
-        lecture_hours = int(self.course_entries["Lecture Hours"].get())
-        practical_hours = int(self.course_entries["Practical Hours"].get())
-        semester = int(self.course_entries["Semester"].get())
-        course_type = self.course_entries["Type"].get()
-        prerequisites = self.course_entries["Prerequisites"].get().split(",")
-
-        new_course = Course(code, name, credit_hours, lecture_hours, practical_hours, semester, course_type, [p.strip() for p in prerequisites])
-        self.knowledge_base.add_course(new_course)
+        try:
+            code = self.course_entries["Code"].get()
+            name = self.course_entries["Name"].get()
+            credit_hours = int(self.course_entries["Credit Hours"].get())
+            lecture_hours = int(self.course_entries["Lecture Hours"].get())
+            practical_hours = int(self.course_entries["Practical Hours"].get())
+            semester = int(self.course_entries["Semester"].get())
+            course_type = self.course_entries["Type"].get()
+            prerequisites = self.course_entries["Prerequisites"].get().split(",")
+
+            new_course = Course(code, name, credit_hours, lecture_hours, practical_hours, semester, course_type, [p.strip() for p in prerequisites if p.strip()])
+            self.knowledge_base.add_course(new_course)
+            if self.store is not None:
+                self.store.save_courses([new_course])
+        except ValueError as error:
+            messagebox.showerror("Invalid input", str(error))
+            return
         messagebox.showinfo("Success", f"New course '{code}' added successfully.")
         self.advisor_portal()
 
@@ -307,35 +1343,22 @@ class AcademicAdvisorApp:
         course_code = self.course_code_entry.get()
         prerequisite_code = self.prerequisite_code_entry.get()
 
-        if course_code in self.knowledge_base.courses and prerequisite_code in self.knowledge_base.courses:
-            self.knowledge_base.courses[course_code].add_prerequisite(prerequisite_code)
+        error = self.knowledge_base.add_prerequisite(course_code, prerequisite_code)
+        if error is None:
+            if self.store is not None:
+                self.store.add_prerequisite(course_code, prerequisite_code)
             messagebox.showinfo("Success", f"Prerequisite '{prerequisite_code}' added for course '{course_code}' successfully.")
         else:
-            messagebox.showerror("Error", "Course or prerequisite not found.")
+            messagebox.showerror("Error", error)
         self.advisor_portal()
 
     def display_all_courses(self):
         self.clear_frame(self.main_frame)
         tk.Label(self.main_frame, text="All Courses in Knowledge Base", font=("Helvetica", 18, "bold"), bg='#e0f7fa', fg='#00796b').pack(pady=20)
 
-        # Create a scrollable frame
-        canvas = Canvas(self.main_frame, bg='#e0f7fa')
-        scroll_y = Scrollbar(self.main_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg='#e0f7fa')
-
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scroll_y.set)
-
-        if self.knowledge_base.courses:
-            for course in self.knowledge_base.courses.values():
-                tk.Label(scrollable_frame, text=f"{course.code}: {course.name}", bg='#e0f7fa', fg='#00796b', font=("Helvetica", 12)).pack()
-        else:
-            tk.Label(scrollable_frame, text="No courses in the knowledge base.", bg='#e0f7fa', fg='#00796b', font=("Helvetica", 12)).pack()
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scroll_y.pack(side="right", fill="y")
+        course_list = CourseListView(self.main_frame, lambda course: f"{course.code}: {course.name}", "No courses in the knowledge base.")
+        course_list.pack(fill="both", expand=True)
+        course_list.set_courses(self.knowledge_base.courses.values())
 
         tk.Button(self.main_frame, text="Back to Main Menu", command=self.create_main_menu, bg='#00796b', fg='white', font=("Helvetica", 12)).pack(pady=5)
 
@@ -353,36 +1376,132 @@ class AcademicAdvisorApp:
     def remove_course(self):
         code = self.delete_course_code_entry.get()
         message = self.knowledge_base.delete_course(code)
+        if self.store is not None and message.endswith("successfully."):
+            self.store.delete_course(code)
         messagebox.showinfo("Course Deletion", message)
         self.advisor_portal()
 
     def clear_frame(self, frame):
-        for widget in frame.winfo_children():
-            widget.destroy()
+        widgets = frame.winfo_children()
+        with instrumentation.span("app.clear_frame", len(widgets)):
+            for widget in widgets:
+                widget.destroy()
+
+CATALOGUE_PATH = "D:\\University\\Semester 6\\KBS\\new.xlsx"
+SNAPSHOT_VERSION = 4
+
+def read_catalogue_table(path, sheet_name=0):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".xlsx", ".xls"):
+        return pd.read_excel(path, sheet_name=sheet_name)
+    if extension == ".csv":
+        return pd.read_csv(path)
+    if extension == ".parquet":
+        return pd.read_parquet(path)
+    raise ValueError(f"Unsupported catalogue format: {extension}")
+
+def courses_from_table(df):
+    prerequisites = df["prerequisites"].fillna("").astype(str).str.split(",")
+    prerequisites = [[code.strip() for code in codes if code.strip()] for codes in prerequisites]
+    columns = [df[column].tolist() for column in ("Code", "Course Name", "CH", "LCT", "LAB", "Semester", "Type")]
+    return list(map(Course, *columns, prerequisites))
+
+def uc_courses_from_table(df):
+    # The uc_courses sheet names its credit hours column "CH " with a trailing space.
+    df = df.rename(columns=lambda column: str(column).strip())
+    zeros = [0] * len(df)
+    return list(map(Course, df["Course Code"].tolist(), df["Course Name"].tolist(), df["CH"].tolist(), zeros, zeros, zeros, ["Unknown"] * len(df), [[] for _ in zeros]))
+
+def source_key(paths):
+    key = []
+    for path in paths:
+        stat = os.stat(path)
+        key.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    return (SNAPSHOT_VERSION, tuple(key))
+
+def load_snapshot(snapshot_path, key):
+    try:
+        with open(snapshot_path, "rb") as snapshot:
+            snapshot_key, knowledge_base = pickle.load(snapshot)
+    except (OSError, pickle.UnpicklingError, AttributeError, ImportError, EOFError, TypeError, ValueError):
+        return None
+    return knowledge_base if snapshot_key == key else None
+
+def save_snapshot(snapshot_path, key, knowledge_base):
+    temporary_path = snapshot_path + ".tmp"
+    try:
+        with open(temporary_path, "wb") as snapshot:
+            pickle.dump((key, knowledge_base), snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, snapshot_path)
+    except OSError:
+        pass
+
+@instrumented("load_data", items=lambda result, *args, **kwargs: len(result.courses))
+def load_data(path=CATALOGUE_PATH, uc_courses_path=None, snapshot_path=None):
+    # Parsing the spreadsheet is slow, so the built knowledge base is pickled next to it and
+    # reused until the source file(s) change. Excel workbooks carry UC courses on their own sheet;
+    # for CSV/Parquet catalogues they come from uc_courses_path.
+    is_workbook = os.path.splitext(path)[1].lower() in (".xlsx", ".xls")
+    sources = [path] if uc_courses_path is None else [path, uc_courses_path]
+    key = source_key(sources)
+    if snapshot_path is None:
+        snapshot_path = path + ".snapshot.pkl"
+    knowledge_base = load_snapshot(snapshot_path, key)
+    if knowledge_base is not None:
+        return knowledge_base
+
+    if is_workbook and uc_courses_path is None:
+        sheets = read_catalogue_table(path, sheet_name=[0, "uc_courses"])
+        df, df_uc_courses = sheets[0], sheets["uc_courses"]
+    else:
+        df = read_catalogue_table(path)
+        df_uc_courses = None if uc_courses_path is None else read_catalogue_table(uc_courses_path)
 
-def load_data():
     knowledge_base = KnowledgeBase()
-
-    # Load courses data
-    df = pd.read_excel("D:\\University\\Semester 6\\KBS\\new.xlsx")
-    for index, row in df.iterrows():
-        course_info = (row["Code"], row["Course Name"], row["CH"], row["LCT"], row["LAB"], row["Semester"], row["Type"],[] if pd.isnull(row["prerequisites"]) else [prerequisite.strip() for prerequisite in row["prerequisites"].split(",")])
-        course = Course(*course_info)
-        knowledge_base.add_course(course)
-
-    # Load UC courses data
-    df_uc_courses = pd.read_excel("D:\\University\\Semester 6\\KBS\\new.xlsx", sheet_name="uc_courses")
-    for index, row in df_uc_courses.iterrows():
-        course_info = (row["Course Code"], row["Course Name"], row["CH "], 0, 0, 0, "Unknown", [])
-        course = Course(*course_info)
+    courses = courses_from_table(df)
+    if df_uc_courses is not None:
+        courses += uc_courses_from_table(df_uc_courses)
+    for course in courses:
         knowledge_base.add_course(course)
 
+    save_snapshot(snapshot_path, key, knowledge_base)
     return knowledge_base
 
 def main():
-    knowledge_base = load_data()
+    parser = argparse.ArgumentParser(description="Academic Advisor System")
+    parser.add_argument("catalogue", nargs="?", default=CATALOGUE_PATH, help="course catalogue (xlsx, csv or parquet)")
+    parser.add_argument("--serve", metavar="HOST:PORT", help="run the headless HTTP advising service instead of the GUI")
+    parser.add_argument("--database", help="SQLite file that keeps the catalogue, students and enrollments between runs")
+    parser.add_argument("--instrument", action="store_true", help="record latency histograms (GET /metrics when serving)")
+    parser.add_argument("--metrics", metavar="PATH", help="write the histograms to PATH on exit (.prom for Prometheus text, JSON otherwise)")
+    parser.add_argument("--profile", metavar="PATH", help="run cProfile on the first request (or GUI action) after start-up and write its stats to PATH")
+    args = parser.parse_args()
+
+    if args.instrument or args.metrics:
+        instrumentation.enable()
+    try:
+        run(args)
+    finally:
+        if args.metrics:
+            instrumentation.REGISTRY.dump(args.metrics)
+
+def run(args):
+    store = None
+    if args.database:
+        store = RegistrationStore(args.database)
+        if not store.has_courses():
+            store.save_courses(load_data(args.catalogue).courses.values())
+        knowledge_base = store.load_knowledge_base()
+    else:
+        knowledge_base = load_data(args.catalogue)
+    if args.profile:
+        instrumentation.profile_next(args.profile)
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        asyncio.run(AdvisingService(knowledge_base, store).serve(host or "127.0.0.1", int(port)))
+        return
     root = tk.Tk()
-    app = AcademicAdvisorApp(root, knowledge_base)
+    app = AcademicAdvisorApp(root, knowledge_base, store)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def peak_rss_mib():
+    # Peak resident set size of this process so far, or None where it cannot be read. On Linux
+    # this is VmHWM, which starts afresh in a spawned worker; ru_maxrss is kept across exec, so a
+    # worker would report its parent's peak as its own.
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+
+import fake_news_server
+import fake_news_train
+from benchmark_utils import peak_rss_mib, percentile
+from fake_news_inference import FakeNewsModel
+
+def run_training_mode(mode, data_path, chunk_size, n_features):
+    # Runs in a fresh process so that ru_maxrss reflects this mode alone. Both modes hold out the
+    # same rows (every HOLDOUT_EVERY-th), so their accuracies are comparable.
+    start = time.perf_counter()
+    if mode == "count":
+        texts, labels = fake_news_train.load_training_data(data_path)
+        test_mask = np.arange(len(labels)) % fake_news_train.HOLDOUT_EVERY == 0
+        vectorizer = CountVectorizer()
+        X = vectorizer.fit_transform(texts)
+        classifier = LogisticRegression()
+        classifier.fit(X[~test_mask], labels[~test_mask])
+        metrics = {"accuracy": float((classifier.predict(X[test_mask]) == labels[test_mask]).mean()), "train_rows": int((~test_mask).sum())}
+    else:
+        _, _, metrics = fake_news_train.train_streaming(data_path, chunk_size, n_features)
+    elapsed = time.perf_counter() - start
+    return {"mode": mode, "accuracy": metrics["accuracy"], "seconds": elapsed, "rows_per_second": metrics["train_rows"] / elapsed, "peak_rss_mib": peak_rss_mib()}
+
+def benchmark_training(data_path, chunk_size, n_features):
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for mode in ("count", "streaming"):
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_training_mode, (mode, data_path, chunk_size, n_features)))
+    return results
+
+async def _run_serving_load(model, texts, max_batch_size, max_delay, concurrency):
+    batcher = fake_news_server.MicroBatcher(model, max_batch_size, max_delay)
+    batcher.start()
+    latencies = []
+    queue = list(texts)
+
+    async def client():
+        while queue:
+            text = queue.pop()
+            start = time.perf_counter()
+            await batcher.score(text)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await batcher.stop()
+    return latencies, elapsed
+
+def benchmark_serving(artifact_dir, data_path, request_count, batch_sizes, max_delay, concurrency):
+    model = FakeNewsModel.load(artifact_dir)
+    _, texts, _ = next(fake_news_train.iter_training_chunks(data_path, request_count))
+    texts = (list(texts) * (request_count // len(texts) + 1))[:request_count]
+    results = []
+    for max_batch_size in batch_sizes:
+        latencies, elapsed = asyncio.run(_run_serving_load(model, texts, max_batch_size, max_delay, concurrency))
+        results.append({"max_batch_size": max_batch_size, "texts_per_second": len(latencies) / elapsed, "p50_ms": percentile(latencies, 0.5) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000})
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake news pipeline benchmarks.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    training_parser = subparsers.add_parser("training", help="CountVectorizer + LogisticRegression against streaming hashing + partial_fit")
+    training_parser.add_argument("--data", default=fake_news_train.DATA_PATH)
+    training_parser.add_argument("--chunk-size", type=int, default=fake_news_train.CHUNK_SIZE)
+    training_parser.add_argument("--n-features", type=int, default=fake_news_train.HASHING_FEATURES)
+    serving_parser = subparsers.add_parser("serving", help="throughput and latency of the micro-batching scorer across batch sizes")
+    serving_parser.add_argument("--data", default=fake_news_train.DATA_PATH, help="CSV the request texts are taken from")
+    serving_parser.add_argument("--artifacts", default=fake_news_train.ARTIFACT_DIR)
+    serving_parser.add_argument("--requests", type=int, default=20000)
+    serving_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128, 512])
+    serving_parser.add_argument("--max-delay-ms", type=float, default=fake_news_server.MAX_DELAY * 1000)
+    serving_parser.add_argument("--concurrency", type=int, default=1024, help="texts in flight at once")
+    args = parser.parse_args()
+
+    if args.benchmark == "training":
+        print(f"{'mode':<12}{'accuracy':>10}{'seconds':>10}{'rows/s':>12}{'peak RSS MiB':>15}")
+        for result in benchmark_training(args.data, args.chunk_size, args.n_features):
+            peak = f"{result['peak_rss_mib']:.1f}" if result["peak_rss_mib"] is not None else "n/a"
+            print(f"{result['mode']:<12}{result['accuracy']:>10.4f}{result['seconds']:>10.2f}{result['rows_per_second']:>12.0f}{peak:>15}")
+    elif args.benchmark == "serving":
+        print(f"{'batch size':<12}{'texts/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for result in benchmark_serving(args.artifacts, args.data, args.requests, args.batch_sizes, args.max_delay_ms / 1000, args.concurrency):
+            print(f"{result['max_batch_size']:<12}{result['texts_per_second']:>10.0f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
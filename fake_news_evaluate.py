@@ -0,0 +1,122 @@
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.tree import DecisionTreeClassifier
+
+import fake_news_train
+from benchmark_utils import peak_rss_mib
+
+REPORT_PATH = "evaluation_report.json"
+
+# The notebook's three models plus the streaming-friendly linear model. Each worker fits one
+# model on one fold, so the models themselves run single-threaded.
+CANDIDATES = {
+    "decision_tree": lambda: DecisionTreeClassifier(random_state=42),
+    "random_forest": lambda: RandomForestClassifier(n_jobs=1, random_state=42),
+    "logistic_regression": lambda: LogisticRegression(),
+    "sgd_log_loss": lambda: SGDClassifier(loss="log_loss", random_state=42),
+}
+
+def evaluate_fold(fold_path, candidate, fold):
+    # The fold's train and test slices were written once by the parent and are memory-mapped, so
+    # the workers fitting different models on one fold read the same pages instead of each
+    # slicing a private copy out of the full matrix. An estimator can still copy its input while
+    # fitting (the trees convert it to float32); peak_rss_growth_mib is what the task added.
+    baseline_rss = peak_rss_mib()
+    X_train, y_train, X_test, y_test = joblib.load(fold_path, mmap_mode="r")
+    model = CANDIDATES[candidate]()
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+    peak_rss = peak_rss_mib()
+
+    return {
+        "candidate": candidate,
+        "fold": fold,
+        "accuracy": float(accuracy_score(y_test, predictions)),
+        "fit_seconds": fit_seconds,
+        "predict_rows_per_second": len(y_test) / predict_seconds if predict_seconds else float("inf"),
+        "peak_rss_mib": peak_rss,
+        "peak_rss_growth_mib": peak_rss - baseline_rss if peak_rss is not None else None,
+        "model_bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+    }
+
+def summarize(folds):
+    summary = {}
+    for candidate in dict.fromkeys(fold["candidate"] for fold in folds):
+        rows = [fold for fold in folds if fold["candidate"] == candidate]
+        accuracies = [row["accuracy"] for row in rows]
+        peaks = [row["peak_rss_mib"] for row in rows if row["peak_rss_mib"] is not None]
+        growths = [row["peak_rss_growth_mib"] for row in rows if row["peak_rss_growth_mib"] is not None]
+        summary[candidate] = {
+            "accuracy_mean": float(np.mean(accuracies)),
+            "accuracy_std": float(np.std(accuracies)),
+            "fit_seconds_mean": float(np.mean([row["fit_seconds"] for row in rows])),
+            "predict_rows_per_second_mean": float(np.mean([row["predict_rows_per_second"] for row in rows])),
+            "peak_rss_mib_max": max(peaks) if peaks else None,
+            "peak_rss_growth_mib_max": max(growths) if growths else None,
+            "model_bytes_mean": float(np.mean([row["model_bytes"] for row in rows])),
+        }
+    return summary
+
+def evaluate(data_path, candidates, n_splits=5, workers=None):
+    texts, labels = fake_news_train.load_training_data(data_path)
+    labels = np.asarray(labels)
+    # float64 is what the linear models fit on, so they can use the memory-mapped data as it is.
+    X = CountVectorizer().fit_transform(texts).astype(np.float64)
+    splits = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42).split(np.zeros(len(labels)), labels)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # Each fold's slices are built once here (the scratch directory holds n_splits copies of
+        # the matrix) and shared by every task of that fold.
+        fold_paths = []
+        for fold, (train_index, test_index) in enumerate(splits):
+            fold_paths.append(os.path.join(scratch, f"fold{fold}.joblib"))
+            joblib.dump((X[train_index], labels[train_index], X[test_index], labels[test_index]), fold_paths[-1])
+        del X
+        # One task per (fold, candidate), each in a fresh spawned process (maxtasksperchild=1) so
+        # that its peak RSS is its own.
+        tasks = [(fold_path, candidate, fold) for fold, fold_path in enumerate(fold_paths) for candidate in candidates]
+        with multiprocessing.get_context("spawn").Pool(workers, maxtasksperchild=1) as pool:
+            folds = pool.starmap(evaluate_fold, tasks, chunksize=1)
+    return {"data_sha256": fake_news_train.file_sha256(data_path), "n_splits": n_splits, "summary": summarize(folds), "folds": folds}
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validate candidate fake news models in parallel and write a JSON cost/accuracy report.")
+    parser.add_argument("--data", default=fake_news_train.DATA_PATH)
+    parser.add_argument("--candidates", nargs="+", choices=sorted(CANDIDATES), default=list(CANDIDATES))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--report", default=REPORT_PATH)
+    args = parser.parse_args()
+
+    report = evaluate(args.data, args.candidates, args.folds, args.workers)
+    with open(args.report, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+    print(f"{'model':<22}{'accuracy':>10}{'fit s':>9}{'predict rows/s':>16}{'peak MiB':>10}{'+MiB':>8}{'size KiB':>10}")
+    for candidate, result in report["summary"].items():
+        peak = f"{result['peak_rss_mib_max']:.0f}" if result["peak_rss_mib_max"] is not None else "n/a"
+        growth = f"{result['peak_rss_growth_mib_max']:.0f}" if result["peak_rss_growth_mib_max"] is not None else "n/a"
+        print(f"{candidate:<22}{result['accuracy_mean']:>10.4f}{result['fit_seconds_mean']:>9.2f}{result['predict_rows_per_second_mean']:>16.0f}{peak:>10}{growth:>8}{result['model_bytes_mean'] / 1024:>10.0f}")
+    print(f"Report written to {args.report}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import time
+
+import instrumentation
+import json_http
+from fake_news_inference import LABELS, FakeNewsModel, PredictionCache
+from fake_news_train import ARTIFACT_DIR
+
+MAX_BATCH_SIZE = 256
+MAX_DELAY = 0.005
+
+
+class MicroBatcher:
+    # Collects texts submitted by concurrent requests and scores them together: a batch is
+    # flushed when it reaches max_batch_size or when its oldest text has waited max_delay seconds.
+    # Each flush is one sparse transform and one predict_proba, run off the event loop.
+    def __init__(self, model, max_batch_size=MAX_BATCH_SIZE, max_delay=MAX_DELAY):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue()
+        self.worker = None
+
+    def start(self):
+        self.worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self.worker.cancel()
+        try:
+            await self.worker
+        except asyncio.CancelledError:
+            pass
+
+    async def score(self, text):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            texts = [text for text, _ in batch]
+            try:
+                probabilities = await loop.run_in_executor(None, self.model.predict_proba, texts)
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            classes = [LABELS[int(label)] for label in self.model.classifier.classes_]
+            for (_, future), row in zip(batch, probabilities):
+                if not future.done():
+                    scores = {label: float(probability) for label, probability in zip(classes, row)}
+                    future.set_result({"label": max(scores, key=scores.get), **scores, "model_version": self.model.version})
+
+
+class ScoringServer:
+    def __init__(self, batcher):
+        self.batcher = batcher
+
+    async def handle(self, method, path, body):
+        if not isinstance(body, dict):
+            return 400, {"error": "Request body must be a JSON object."}
+        if method == "POST" and path == "/classify":
+            text = body.get("text")
+            if not isinstance(text, str):
+                return 400, {"error": "Expected a 'text' string."}
+            return 200, await self.batcher.score(text)
+        if method == "POST" and path == "/classify/batch":
+            texts = body.get("texts")
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                return 400, {"error": "Expected a 'texts' list of strings."}
+            return 200, {"results": await asyncio.gather(*(self.batcher.score(text) for text in texts))}
+        if method == "GET" and path == "/health":
+            cache = self.batcher.model.cache
+            return 200, {"model_version": self.batcher.model.version, "cache": None if cache is None else cache.stats()}
+        if method == "GET" and path == "/metrics":
+            # Prometheus text exposition; empty unless the server runs with --instrument.
+            return 200, instrumentation.REGISTRY.to_prometheus()
+        return 404, {"error": "Not found."}
+
+    async def handle_connection(self, reader, writer):
+        # A scoring failure (e.g. predict_proba raising for a batch) is answered with 500.
+        await json_http.serve_connection(reader, writer, self.handle)
+
+async def serve(model, host, port, max_batch_size=MAX_BATCH_SIZE, max_delay=MAX_DELAY):
+    batcher = MicroBatcher(model, max_batch_size, max_delay)
+    batcher.start()
+    server = await asyncio.start_server(ScoringServer(batcher).handle_connection, host, port)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching fake news scoring server.")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR)
+    parser.add_argument("--version", help="model version to serve (default: latest)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-delay-ms", type=float, default=MAX_DELAY * 1000)
+    parser.add_argument("--cache-size", type=int, default=100000, help="predictions kept in memory (0 disables the cache)")
+    parser.add_argument("--cache-path", help="SQLite file for a prediction cache that survives restarts")
+    parser.add_argument("--instrument", action="store_true", help="record latency histograms, exposed on GET /metrics")
+    parser.add_argument("--profile", metavar="PATH", help="run cProfile on the first scored batch and write its stats to PATH")
+    args = parser.parse_args()
+
+    if args.instrument:
+        instrumentation.enable()
+    if args.profile:
+        instrumentation.profile_next(args.profile)
+
+    cache = PredictionCache(args.cache_size, args.cache_path) if args.cache_size > 0 else None
+    start = time.perf_counter()
+    model = FakeNewsModel.load(args.artifacts, args.version, cache=cache)
+    print(f"Loaded model {model.version} in {(time.perf_counter() - start) * 1000:.1f} ms, serving on {args.host}:{args.port}")
+    asyncio.run(serve(model, args.host, args.port, args.max_batch_size, args.max_delay_ms / 1000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+DATA_PATH = "train.csv"
+ARTIFACT_DIR = "models"
+LATEST_FILE = "LATEST"
+CLASSES = [0, 1]
+HASHING_FEATURES = 2 ** 20
+CHUNK_SIZE = 10000
+HOLDOUT_EVERY = 5
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as data:
+        for chunk in iter(lambda: data.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_training_data(path=DATA_PATH):
+    # Same preparation as the notebook: the text column as unicode strings and the 0 (true) / 1 (fake) label.
+    data = pd.read_csv(path, usecols=["text", "label"])
+    return data["text"].astype("U").values, data["label"].values
+
+def train(texts, labels, test_size=0.2, random_state=42):
+    vectorizer = CountVectorizer()
+    X = vectorizer.fit_transform(texts)
+    X_train, X_test, y_train, y_test = train_test_split(X, labels, test_size=test_size, random_state=random_state)
+    classifier = LogisticRegression()
+    classifier.fit(X_train, y_train)
+    metrics = {"accuracy": float(accuracy_score(y_test, classifier.predict(X_test))), "train_rows": int(X_train.shape[0]), "test_rows": int(X_test.shape[0])}
+    return vectorizer, classifier, metrics
+
+def iter_training_chunks(path=DATA_PATH, chunk_size=CHUNK_SIZE):
+    # Yields (row_numbers, texts, labels) without ever holding more than one chunk of the CSV.
+    start = 0
+    for chunk in pd.read_csv(path, usecols=["text", "label"], chunksize=chunk_size):
+        yield np.arange(start, start + len(chunk)), chunk["text"].astype("U").values, chunk["label"].values
+        start += len(chunk)
+
+def train_streaming(path=DATA_PATH, chunk_size=CHUNK_SIZE, n_features=HASHING_FEATURES, holdout_every=HOLDOUT_EVERY):
+    # Out-of-core alternative to train(): a HashingVectorizer has no vocabulary to fit or ship, and
+    # SGDClassifier(loss="log_loss") is a logistic regression that learns one chunk at a time, so
+    # memory stays bounded by chunk_size whatever the size of the corpus. Every holdout_every-th
+    # row is held out; a second streaming pass scores them with the final model.
+    vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False)
+    classifier = SGDClassifier(loss="log_loss", random_state=42)
+    train_rows = 0
+    for rows, texts, labels in iter_training_chunks(path, chunk_size):
+        train_mask = rows % holdout_every != 0
+        if train_mask.any():
+            classifier.partial_fit(vectorizer.transform(texts[train_mask]), labels[train_mask], classes=CLASSES)
+            train_rows += int(train_mask.sum())
+
+    correct = test_rows = 0
+    for rows, texts, labels in iter_training_chunks(path, chunk_size):
+        test_mask = rows % holdout_every == 0
+        if test_mask.any():
+            correct += int((classifier.predict(vectorizer.transform(texts[test_mask])) == labels[test_mask]).sum())
+            test_rows += int(test_mask.sum())
+    metrics = {"accuracy": correct / test_rows if test_rows else float("nan"), "train_rows": train_rows, "test_rows": test_rows}
+    return vectorizer, classifier, metrics
+
+def save_artifacts(vectorizer, classifier, data_hash, metrics, artifact_dir=ARTIFACT_DIR):
+    # Each run gets its own versioned directory; runs within the same second get a -2, -3, ...
+    # suffix. The classifier is dumped uncompressed with joblib so that fake_news_inference can
+    # memory-map its arrays. The vectorizer is a plain pickle: a CountVectorizer is mostly its
+    # vocabulary_ dict, which joblib's pure-Python unpickler loads several times slower and
+    # cannot memory-map anyway. LATEST is switched last, so readers never see a half-written version.
+    os.makedirs(artifact_dir, exist_ok=True)
+    base_version = f"{time.strftime('%Y%m%d-%H%M%S')}-{data_hash[:12]}"
+    version = base_version
+    attempt = 1
+    while True:
+        version_dir = os.path.join(artifact_dir, version)
+        try:
+            os.mkdir(version_dir)
+            break
+        except FileExistsError:
+            attempt += 1
+            version = f"{base_version}-{attempt}"
+    with open(os.path.join(version_dir, "vectorizer.pkl"), "wb") as vectorizer_file:
+        pickle.dump(vectorizer, vectorizer_file, protocol=pickle.HIGHEST_PROTOCOL)
+    joblib.dump(classifier, os.path.join(version_dir, "classifier.joblib"))
+    metadata = {
+        "version": version,
+        "data_sha256": data_hash,
+        "vectorizer": type(vectorizer).__name__,
+        "classifier": type(classifier).__name__,
+        "classes": [int(label) for label in classifier.classes_],
+        "sklearn_version": sklearn.__version__,
+        "metrics": metrics,
+    }
+    with open(os.path.join(version_dir, "metadata.json"), "w") as metadata_file:
+        json.dump(metadata, metadata_file, indent=2)
+
+    latest_path = os.path.join(artifact_dir, LATEST_FILE)
+    with open(latest_path + ".tmp", "w") as latest:
+        latest.write(version)
+    os.replace(latest_path + ".tmp", latest_path)
+    return version_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the fake news classifier and save it as a versioned artifact.")
+    parser.add_argument("--data", default=DATA_PATH, help="training CSV with 'text' and 'label' columns")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR, help="directory that holds the model versions")
+    parser.add_argument("--streaming", action="store_true", help="train out-of-core with a hashing vectorizer and partial_fit")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows per chunk in streaming mode")
+    parser.add_argument("--n-features", type=int, default=HASHING_FEATURES, help="hashing vectorizer width in streaming mode")
+    args = parser.parse_args()
+
+    data_hash = file_sha256(args.data)
+    if args.streaming:
+        vectorizer, classifier, metrics = train_streaming(args.data, args.chunk_size, args.n_features)
+    else:
+        texts, labels = load_training_data(args.data)
+        vectorizer, classifier, metrics = train(texts, labels)
+    version_dir = save_artifacts(vectorizer, classifier, data_hash, metrics, args.artifacts)
+    print(f"Accuracy: {metrics['accuracy']:.4f}")
+    print(f"Saved model to {version_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import bisect
+import cProfile
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ITEM_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 100000)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self):
+        return {"buckets": dict(zip(map(str, self.buckets + ("+Inf",)), self.counts)), "sum": self.sum, "count": self.count}
+
+
+class MetricsRegistry:
+    # For each instrumented name: a latency histogram (its count is the call count) and, when the
+    # call reports how many items it handled, an item-count histogram.
+    def __init__(self):
+        self.latency = {}
+        self.items = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, items=None):
+        with self._lock:
+            if name not in self.latency:
+                self.latency[name] = Histogram(LATENCY_BUCKETS)
+            self.latency[name].observe(seconds)
+            if items is not None:
+                if name not in self.items:
+                    self.items[name] = Histogram(ITEM_BUCKETS)
+                self.items[name].observe(items)
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.items.clear()
+
+    def to_json(self):
+        with self._lock:
+            return {
+                name: {"latency_seconds": histogram.to_dict(), "items": self.items[name].to_dict() if name in self.items else None}
+                for name, histogram in self.latency.items()
+            }
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            for suffix, histograms in (("seconds", self.latency), ("items", self.items)):
+                for name, histogram in histograms.items():
+                    metric = f"{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_{suffix}"
+                    lines.append(f"# TYPE {metric} histogram")
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                    lines.append(f"{metric}_sum {histogram.sum}")
+                    lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        # Prometheus text for *.prom / *.txt, JSON otherwise.
+        with open(path, "w") as output:
+            if os.path.splitext(path)[1] in (".prom", ".txt"):
+                output.write(self.to_prometheus())
+            else:
+                json.dump(self.to_json(), output, indent=2)
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _State:
+    enabled = os.environ.get("INSTRUMENTATION", "") not in ("", "0")
+    profile_path = os.environ.get("INSTRUMENTATION_PROFILE") or None
+    profiling = False
+    lock = threading.Lock()
+
+
+_state = _State()
+
+def enable():
+    _state.enabled = True
+
+def disable():
+    _state.enabled = False
+
+def is_enabled():
+    return _state.enabled
+
+def profile_next(path):
+    # The next instrumented call that is not nested inside another one runs under cProfile and
+    # writes its stats to path (read them with pstats or snakeviz). Enables instrumentation.
+    _state.profile_path = path
+    _state.enabled = True
+
+def _call(name, items, func, args, kwargs):
+    profiler = None
+    if _state.profile_path is not None:
+        with _state.lock:
+            if _state.profile_path is not None and not _state.profiling:
+                profile_path, _state.profile_path = _state.profile_path, None
+                profiler = cProfile.Profile()
+                _state.profiling = True
+        if profiler is not None:
+            profiler.enable()
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            _state.profiling = False
+            profiler.dump_stats(profile_path)
+    REGISTRY.record(name, elapsed, None if items is None else items(result, *args, **kwargs))
+    return result
+
+def instrumented(name, items=None):
+    # Decorator. items(result, *args, **kwargs) returns the number of items the call handled.
+    # While instrumentation is disabled a call still pays for the extra wrapper frame (roughly
+    # 0.1 us), so only wrap calls that do real work; time sub-microsecond methods such as
+    # Student.can_register_for_course at their caller instead.
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            return _call(name, items, func, args, kwargs)
+        return wrapper
+    return decorate
+
+@contextmanager
+def _timed_span(name, items):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.record(name, time.perf_counter() - start, items)
+
+# Shared and reusable, so a disabled span costs no allocation.
+_NO_SPAN = nullcontext()
+
+def span(name, items=None):
+    # Context manager for timing a block inside a function.
+    if not _state.enabled:
+        return _NO_SPAN
+    return _timed_span(name, items)
@@ -0,0 +1,49 @@
+import asyncio
+import json
+import urllib.parse
+
+HTTP_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"}
+
+
+async def serve_connection(reader, writer, handle):
+    # Minimal HTTP/1.1 keep-alive loop for the JSON services, used as the asyncio.start_server
+    # callback. handle(method, path, body) is a coroutine returning (status, payload); the path is
+    # percent-decoded without its query string and body is the decoded JSON (an empty body is {}).
+    # A str payload is sent as Prometheus text, anything else as JSON.
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            content_length = int(headers.get("content-length", 0))
+            raw_body = await reader.readexactly(content_length) if content_length else b""
+            try:
+                body = json.loads(raw_body) if raw_body else {}
+            except ValueError:
+                status, payload = 400, {"error": "Request body is not valid JSON."}
+            else:
+                try:
+                    status, payload = await handle(method, urllib.parse.unquote(target.split("?", 1)[0]), body)
+                except Exception:
+                    status, payload = 500, {"error": "Internal server error."}
+            if isinstance(payload, str):
+                response, content_type = payload.encode(), "text/plain; version=0.0.4"
+            else:
+                response, content_type = json.dumps(payload).encode(), "application/json"
+            keep_alive = headers.get("connection", "").lower() != "close"
+            writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: {content_type}\r\nContent-Length: {len(response)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + response)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
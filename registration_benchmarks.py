@@ -0,0 +1,452 @@
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmark_utils import percentile
+
+SUITE_HISTORY_PATH = "registration_benchmark_history.jsonl"
+SUITE_STAGES = ("catalogue_load_cold", "catalogue_load_snapshot", "advise_courses", "registration_replay", "add_course", "add_prerequisite", "delete_course")
+
+REGISTRATION_SYSTEM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Knowledge-based Systems-for_Course Registration_System.py")
+
+def load_registration_system():
+    # The registration system is a script whose file name is not importable, so load it by path.
+    spec = importlib.util.spec_from_file_location("registration_system", REGISTRATION_SYSTEM_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+registration = load_registration_system()
+
+
+class LegacyCourse:
+    # The original dict-backed, list-based layout, kept only as a baseline for comparison.
+    def __init__(self, code, name, credit_hours, lecture_hours, practical_hours, semester, course_type, prerequisites=None):
+        self.code = code
+        self.name = name
+        self.credit_hours = credit_hours
+        self.lecture_hours = lecture_hours
+        self.practical_hours = practical_hours
+        self.semester = semester
+        self.course_type = course_type
+        self.prerequisites = prerequisites if prerequisites is not None else []
+
+
+class LegacyStudent:
+    def __init__(self):
+        self.semester = 0
+        self.cgpa = 0.0
+        self.passed_courses = []
+        self.failed_courses = []
+        self.registered_courses = []
+
+    def add_passed_course(self, course_code):
+        self.passed_courses.append(course_code)
+
+    def add_failed_course(self, course_code):
+        self.failed_courses.append(course_code)
+
+    def can_register_for_course(self, course):
+        if course.semester > self.semester:
+            return "higher semester"
+        if any(prerequisite not in self.passed_courses for prerequisite in course.prerequisites):
+            return "missing prerequisites"
+        if course.credit_hours + sum(course.credit_hours for course in self.registered_courses) > 22:
+            return "credit limit"
+        return None
+
+    def enroll_course(self, course):
+        registration_status = self.can_register_for_course(course)
+        if registration_status:
+            return registration_status
+        elif course.code in [c.code for c in self.registered_courses]:
+            return "already enrolled"
+        self.registered_courses.append(course)
+        return None
+
+    def drop_course(self, course_code):
+        for course in self.registered_courses:
+            if course.code == course_code:
+                self.registered_courses.remove(course)
+                return None
+        return "not found"
+
+
+def make_catalogue(course_class, course_count, seed):
+    rng = random.Random(seed)
+    courses = []
+    for index in range(course_count):
+        prerequisites = [courses[rng.randrange(index)].code for _ in range(min(index, rng.randint(0, 3)))]
+        courses.append(course_class(f"C{index:05d}", f"Course {index}", rng.choice((2, 3, 4)), 2, 1, 1 + index * 8 // course_count, "Core", prerequisites))
+    return courses
+
+def make_students(student_class, courses, student_count, passed_per_student, seed):
+    rng = random.Random(seed)
+    students = []
+    for _ in range(student_count):
+        student = student_class()
+        student.semester = 8
+        student.cgpa = 3.5
+        for course in rng.sample(courses, passed_per_student):
+            student.add_passed_course(course.code)
+        for course in rng.sample(courses, 2):
+            student.add_failed_course(course.code)
+        students.append(student)
+    return students
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def time_registration_replay(students, courses, seed):
+    rng = random.Random(seed)
+    attempts = [(student, rng.sample(courses, 8)) for student in students]
+    start = time.perf_counter()
+    for student, picks in attempts:
+        for course in picks:
+            student.enroll_course(course)
+        for course in picks[:4]:
+            student.drop_course(course.code)
+    return time.perf_counter() - start
+
+def benchmark_layouts(course_count, student_count, passed_per_student, seed):
+    layouts = {"legacy": (LegacyCourse, LegacyStudent), "compact": (registration.Course, registration.Student)}
+    results = {}
+    for layout, (course_class, student_class) in layouts.items():
+        courses, catalogue_bytes = measure_memory(lambda: make_catalogue(course_class, course_count, seed))
+        students, student_bytes = measure_memory(lambda: make_students(student_class, courses, student_count, passed_per_student, seed))
+        results[layout] = {
+            "catalogue_bytes": catalogue_bytes,
+            "student_bytes": student_bytes,
+            "replay_seconds": time_registration_replay(students, courses, seed),
+        }
+    return results
+
+def benchmark_recommender(course_count, student_count, passed_per_student, top_k, seed):
+    knowledge_base = registration.KnowledgeBase()
+    courses = make_catalogue(registration.Course, course_count, seed)
+    for course in courses:
+        knowledge_base.add_course(course)
+    students = make_students(registration.Student, courses, student_count, passed_per_student, seed)
+    latencies = []
+    for student in students:
+        # Clearing the memo every time measures the cold, worst-case path.
+        registration.best_schedules.cache_clear()
+        start = time.perf_counter()
+        knowledge_base.recommend_schedules(student, top_k=top_k)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+async def _run_service_load(service, request_bodies, concurrency):
+    server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    latencies = []
+    queue = list(reversed(request_bodies))
+
+    async def client():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        while queue:
+            body = json.dumps(queue.pop()).encode()
+            start = time.perf_counter()
+            writer.write(b"POST /advise HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+            await writer.drain()
+            content_length = 0
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    content_length = int(line.split(b":")[1])
+            await reader.readexactly(content_length)
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    start = time.perf_counter()
+    async with server:
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+def benchmark_service(course_count, request_count, passed_per_student, concurrency, seed):
+    # Client and server share one event loop, so the figures include the load generator's own cost.
+    knowledge_base = registration.KnowledgeBase()
+    courses = make_catalogue(registration.Course, course_count, seed)
+    for course in courses:
+        knowledge_base.add_course(course)
+    rng = random.Random(seed)
+    request_bodies = [
+        {"semester": 8, "cgpa": 3.5, "passed_courses": [course.code for course in rng.sample(courses, passed_per_student)], "failed_courses": []}
+        for _ in range(request_count)
+    ]
+    return asyncio.run(_run_service_load(registration.AdvisingService(knowledge_base), request_bodies, concurrency))
+
+def make_university(course_count, depth, fan_out, seed):
+    # A layered catalogue: courses are split into depth levels spread over the eight semesters,
+    # every course in a level is a prerequisite of fan_out courses in the next level, and every
+    # course above the first level has at least one prerequisite, so the longest chain is depth
+    # (at most course_count, as every level needs a course).
+    rng = random.Random(seed)
+    depth = min(depth, course_count)
+    levels = [[] for _ in range(depth)]
+    for index in range(course_count):
+        levels[index * depth // course_count].append(index)
+    prerequisites = {index: set() for index in range(course_count)}
+    for lower, upper in zip(levels, levels[1:]):
+        for index in lower:
+            for dependent in rng.sample(upper, min(fan_out, len(upper))):
+                prerequisites[dependent].add(index)
+        for index in upper:
+            if not prerequisites[index]:
+                prerequisites[index].add(rng.choice(lower))
+    courses = []
+    for level, indices in enumerate(levels):
+        for index in indices:
+            courses.append(registration.Course(
+                f"C{index:06d}", f"Course {index}", rng.choice((2, 3, 3, 4)), 2, rng.choice((0, 1)),
+                1 + level * 8 // depth, rng.choice(("Core", "Core", "Elective")),
+                [f"C{prerequisite:06d}" for prerequisite in sorted(prerequisites[index])],
+            ))
+    return courses
+
+def make_cohort(courses, student_count, seed, courses_per_semester=6, pass_rate=0.85):
+    # Each student walks the semesters below their own, taking up to courses_per_semester courses
+    # whose prerequisites they have passed, so transcripts stay realistic at any catalogue size.
+    rng = random.Random(seed)
+    dependents = {course.code: [] for course in courses}
+    entry_courses = []
+    for course in courses:
+        for prerequisite in course.prerequisites:
+            dependents[prerequisite].append(course)
+        if not course.prerequisites:
+            entry_courses.append(course)
+    students = []
+    for _ in range(student_count):
+        student = registration.Student()
+        student.set_semester(rng.randint(1, 8))
+        student.set_cgpa(round(rng.uniform(1.5, 4.0), 2))
+        passed = set()
+        for semester in range(1, student.semester):
+            candidates = {
+                course.code: course
+                for code in sorted(passed) for course in dependents[code]
+                if course.semester <= semester and course.code not in passed and all(prerequisite in passed for prerequisite in course.prerequisites)
+            }
+            for course in rng.sample(entry_courses, min(courses_per_semester, len(entry_courses))):
+                if course.code not in passed:
+                    candidates.setdefault(course.code, course)
+            for course in rng.sample(list(candidates.values()), min(courses_per_semester, len(candidates))):
+                if rng.random() < pass_rate:
+                    passed.add(course.code)
+                    student.add_passed_course(course.code)
+                else:
+                    student.add_failed_course(course.code)
+        students.append(student)
+    return students
+
+def write_catalogue_csv(courses, path):
+    registration.pd.DataFrame({
+        "Code": [course.code for course in courses],
+        "Course Name": [course.name for course in courses],
+        "CH": [course.credit_hours for course in courses],
+        "LCT": [course.lecture_hours for course in courses],
+        "LAB": [course.practical_hours for course in courses],
+        "Semester": [course.semester for course in courses],
+        "Type": [course.course_type for course in courses],
+        "prerequisites": [",".join(course.prerequisites) for course in courses],
+    }).to_csv(path, index=False)
+
+def run_suite_scale(course_count, student_count, depth, fan_out, seed):
+    # One pass over every stage on fresh data; returns {stage: {"seconds": ..., "ops": ...}}.
+    courses = make_university(course_count, depth, fan_out, seed)
+    students = make_cohort(courses, student_count, seed)
+    rng = random.Random(seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        catalogue_path = os.path.join(scratch, "catalogue.csv")
+        write_catalogue_csv(courses, catalogue_path)
+        start = time.perf_counter()
+        knowledge_base = registration.load_data(catalogue_path)
+        results["catalogue_load_cold"] = {"seconds": time.perf_counter() - start, "ops": len(courses)}
+        start = time.perf_counter()
+        knowledge_base = registration.load_data(catalogue_path)
+        results["catalogue_load_snapshot"] = {"seconds": time.perf_counter() - start, "ops": len(courses)}
+
+    latencies = []
+    advised = []
+    for student in students:
+        start = time.perf_counter()
+        advised.append(knowledge_base.advise_courses(student))
+        latencies.append(time.perf_counter() - start)
+    results["advise_courses"] = {"seconds": sum(latencies), "ops": len(students), "p99_ms": percentile(latencies, 0.99) * 1000}
+
+    # Half of each student's attempts are advised courses, half are arbitrary ones that mostly fail.
+    catalogue = list(knowledge_base.courses.values())
+    attempts = [(student, rng.sample(courses_advised, min(4, len(courses_advised))) + rng.sample(catalogue, min(4, len(catalogue)))) for student, courses_advised in zip(students, advised)]
+    operations = 0
+    start = time.perf_counter()
+    for student, picks in attempts:
+        for course in picks:
+            student.can_register_for_course(course)
+            student.enroll_course(course)
+        for course in picks[::2]:
+            student.drop_course(course.code)
+        operations += len(picks) * 2 + len(picks[::2])
+    results["registration_replay"] = {"seconds": time.perf_counter() - start, "ops": operations}
+
+    mutation_count = min(max(10, course_count // 100), len(catalogue))
+    new_courses = [
+        registration.Course(f"N{index:06d}", f"New course {index}", 3, 2, 1, 8, "Elective", [course.code for course in rng.sample(catalogue, min(fan_out, len(catalogue)))])
+        for index in range(mutation_count)
+    ]
+    start = time.perf_counter()
+    for course in new_courses:
+        knowledge_base.add_course(course)
+    results["add_course"] = {"seconds": time.perf_counter() - start, "ops": mutation_count}
+    # Linking random pairs forces reordering of the topological order; pairs that would form a
+    # cycle are rejected, which is part of the cost being measured.
+    pairs = [tuple(course.code for course in rng.sample(catalogue, 2)) for _ in range(mutation_count if len(catalogue) > 1 else 0)]
+    start = time.perf_counter()
+    for course_code, prerequisite_code in pairs:
+        knowledge_base.add_prerequisite(course_code, prerequisite_code)
+    results["add_prerequisite"] = {"seconds": time.perf_counter() - start, "ops": len(pairs)}
+    doomed = [course.code for course in rng.sample(catalogue, mutation_count)]
+    start = time.perf_counter()
+    for code in doomed:
+        knowledge_base.delete_course(code)
+    results["delete_course"] = {"seconds": time.perf_counter() - start, "ops": mutation_count}
+    return results
+
+def benchmark_suite(course_count, student_count, depth, fan_out, scales, repeat, seed):
+    # The fastest of repeat runs is kept for each stage, which is the figure least disturbed by noise.
+    results = {}
+    for scale in scales:
+        runs = [run_suite_scale(course_count * scale, student_count * scale, depth, fan_out, seed) for _ in range(repeat)]
+        results[f"{scale}x"] = {stage: min((run[stage] for run in runs), key=lambda result: result["seconds"]) for stage in SUITE_STAGES}
+    return results
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(REGISTRATION_SYSTEM_PATH), capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_baseline(history_path, config):
+    # The most recent earlier run with the same configuration on the same machine.
+    baseline = None
+    try:
+        with open(history_path) as history:
+            for line in history:
+                run = json.loads(line)
+                if run["config"] == config and run["machine"] == platform.node():
+                    baseline = run
+    except FileNotFoundError:
+        pass
+    return baseline
+
+def find_regressions(results, baseline, tolerance, noise_floor=0.001):
+    regressions = []
+    for scale, stages in results.items():
+        for stage, result in stages.items():
+            previous = baseline["results"].get(scale, {}).get(stage)
+            if previous is None:
+                continue
+            slowdown = result["seconds"] - previous["seconds"]
+            if slowdown > noise_floor and result["seconds"] > previous["seconds"] * (1 + tolerance):
+                regressions.append((scale, stage, previous["seconds"], result["seconds"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Registration engine benchmarks.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    layouts_parser = subparsers.add_parser("layouts", help="memory and enroll/drop speed of the legacy and compact Course/Student layouts")
+    layouts_parser.add_argument("--courses", type=int, default=2000)
+    layouts_parser.add_argument("--students", type=int, default=20000)
+    layouts_parser.add_argument("--passed", type=int, default=40, help="passed courses per student")
+
+    recommender_parser = subparsers.add_parser("recommender", help="worst-case latency of KnowledgeBase.recommend_schedules")
+    recommender_parser.add_argument("--courses", type=int, default=2000)
+    recommender_parser.add_argument("--students", type=int, default=500)
+    recommender_parser.add_argument("--passed", type=int, default=200, help="passed courses per student")
+    recommender_parser.add_argument("--top-k", type=int, default=3)
+    recommender_parser.add_argument("--target-ms", type=float, default=50.0, help="exit with status 1 if the worst case exceeds this")
+
+    service_parser = subparsers.add_parser("service", help="p50/p99 latency and throughput of the HTTP advising service")
+    service_parser.add_argument("--courses", type=int, default=500)
+    service_parser.add_argument("--requests", type=int, default=5000)
+    service_parser.add_argument("--passed", type=int, default=40, help="passed courses per student")
+    service_parser.add_argument("--concurrency", type=int, default=50)
+
+    suite_parser = subparsers.add_parser("suite", help="catalogue load, advising, registration replay and catalogue mutations at several scales, compared with the previous run")
+    suite_parser.add_argument("--courses", type=int, default=60, help="courses at 1x scale")
+    suite_parser.add_argument("--students", type=int, default=200, help="students at 1x scale")
+    suite_parser.add_argument("--depth", type=int, default=8, help="length of the longest prerequisite chain")
+    suite_parser.add_argument("--fan-out", type=int, default=3, help="courses each course is a prerequisite of in the next level")
+    suite_parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    suite_parser.add_argument("--repeat", type=int, default=3)
+    suite_parser.add_argument("--history", default=SUITE_HISTORY_PATH, help="JSON-lines file every run is appended to")
+    suite_parser.add_argument("--tolerance", type=float, default=0.2, help="exit with status 1 if a stage is this much slower than the previous run")
+    suite_parser.add_argument("--no-save", action="store_true", help="compare with the history without appending this run")
+
+    for subparser in (layouts_parser, recommender_parser, service_parser, suite_parser):
+        subparser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.benchmark == "suite":
+        for name in ("courses", "students", "depth", "repeat"):
+            if getattr(args, name) < 1:
+                suite_parser.error(f"--{name} must be at least 1")
+        if args.fan_out < 0 or args.tolerance < 0 or min(args.scales) < 1:
+            suite_parser.error("--fan-out and --tolerance must not be negative and --scales must be at least 1")
+
+    if args.benchmark == "layouts":
+        results = benchmark_layouts(args.courses, args.students, args.passed, args.seed)
+        print(f"{'layout':<10}{'catalogue MiB':>15}{'students MiB':>15}{'replay s':>12}")
+        for layout, result in results.items():
+            print(f"{layout:<10}{result['catalogue_bytes'] / 2**20:>15.2f}{result['student_bytes'] / 2**20:>15.2f}{result['replay_seconds']:>12.3f}")
+    elif args.benchmark == "recommender":
+        latencies = benchmark_recommender(args.courses, args.students, args.passed, args.top_k, args.seed)
+        worst_ms = max(latencies) * 1000
+        print(f"p50 {percentile(latencies, 0.5) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms, max {worst_ms:.2f} ms")
+        if worst_ms > args.target_ms:
+            print(f"worst case exceeds the {args.target_ms:.0f} ms target")
+            sys.exit(1)
+    elif args.benchmark == "service":
+        latencies, elapsed = benchmark_service(args.courses, args.requests, args.passed, args.concurrency, args.seed)
+        print(f"{len(latencies) / elapsed:.0f} requests/s, p50 {percentile(latencies, 0.5) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+    elif args.benchmark == "suite":
+        config = {"courses": args.courses, "students": args.students, "depth": args.depth, "fan_out": args.fan_out, "scales": args.scales, "repeat": args.repeat, "seed": args.seed}
+        baseline = load_baseline(args.history, config)
+        results = benchmark_suite(args.courses, args.students, args.depth, args.fan_out, args.scales, args.repeat, args.seed)
+        print(f"{'scale':<7}{'stage':<25}{'ops':>9}{'seconds':>10}{'us/op':>10}{'vs previous':>13}")
+        for scale, stages in results.items():
+            for stage, result in stages.items():
+                previous = baseline["results"].get(scale, {}).get(stage) if baseline is not None else None
+                change = f"{(result['seconds'] / previous['seconds'] - 1) * 100:+.1f}%" if previous and previous["seconds"] else "n/a"
+                per_operation = f"{result['seconds'] / result['ops'] * 1e6:.2f}" if result["ops"] else "n/a"
+                print(f"{scale:<7}{stage:<25}{result['ops']:>9}{result['seconds']:>10.4f}{per_operation:>10}{change:>13}")
+        if not args.no_save:
+            run = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": current_commit(), "machine": platform.node(), "python": platform.python_version(), "config": config, "results": results}
+            with open(args.history, "a") as history:
+                history.write(json.dumps(run) + "\n")
+        if baseline is not None:
+            regressions = find_regressions(results, baseline, args.tolerance)
+            for scale, stage, before, after in regressions:
+                print(f"regression: {stage} at {scale} took {after:.4f} s, previously {before:.4f} s (commit {baseline['commit']})")
+            if regressions:
+                sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import instrumentation
+import registration_system as registration
+
+
+def make_service():
+    knowledge_base = registration.KnowledgeBase()
+    knowledge_base.add_course(registration.Course("SV101", "Programming", 3, 2, 1, 1, "Core"))
+    knowledge_base.add_course(registration.Course("SV201", "Data Structures", 3, 2, 1, 2, "Core", ["SV101"]))
+    service = registration.AdvisingService(knowledge_base)
+    status, _ = service.dispatch("PUT", "/students/s1", {"semester": 2, "cgpa": 3.2, "passed_courses": ["SV101"]})
+    assert status == 201
+    return service
+
+
+def test_add_course_rejects_non_string_fields():
+    service = make_service()
+    for field, value in (("code", 5), ("name", ["x"]), ("type", None)):
+        body = {"code": "SV301", "name": "Algorithms", "credit_hours": 3, "semester": 3, "type": "Core"}
+        body[field] = value
+        status, payload = service.dispatch("POST", "/courses", body)
+        assert status == 400, field
+        assert field in payload["error"]
+    assert "SV301" not in service.knowledge_base.courses
+
+
+def test_add_course_rejects_existing_code():
+    service = make_service()
+    status, _ = service.dispatch("POST", "/courses", {"code": "SV101", "name": "Other", "credit_hours": 4, "semester": 1})
+    assert status == 409
+    assert service.knowledge_base.courses["SV101"].name == "Programming"
+
+
+def test_added_course_can_be_deleted():
+    service = make_service()
+    assert service.dispatch("POST", "/courses", {"code": "SV301", "name": "Algorithms", "credit_hours": 3, "semester": 2, "prerequisites": ["SV201"]})[0] == 201
+    assert service.dispatch("DELETE", "/courses/SV301", {})[0] == 200
+    assert service.dispatch("DELETE", "/courses/SV301", {})[0] == 404
+
+
+def test_enroll_status_reflects_rejections():
+    service = make_service()
+    assert service.dispatch("POST", "/students/s1/enroll", {"code": "SV201"})[0] == 200
+    status, payload = service.dispatch("POST", "/students/s1/enroll", {"code": "SV201"})
+    assert status == 409
+    assert payload["message"] == "You are already enrolled in this course."
+    assert service.dispatch("POST", "/students/s1/enroll", {"code": "SV101"})[0] == 200
+    assert service.dispatch("POST", "/students/s1/drop", {"code": "SV201"})[0] == 200
+    assert service.dispatch("POST", "/students/s1/drop", {"code": "SV201"})[0] == 404
+
+
+def test_add_prerequisite_statuses():
+    service = make_service()
+    assert service.dispatch("POST", "/courses/SV201/prerequisites", {})[0] == 400
+    assert service.dispatch("POST", "/courses/SV201/prerequisites", {"prerequisite": 7})[0] == 400
+    assert service.dispatch("POST", "/courses/SV201/prerequisites", {"prerequisite": "NOPE"})[0] == 404
+    assert service.dispatch("POST", "/courses/NOPE/prerequisites", {"prerequisite": "SV101"})[0] == 404
+    assert service.dispatch("POST", "/courses/SV101/prerequisites", {"prerequisite": "SV201"})[0] == 409
+    assert service.dispatch("POST", "/courses/SV201/prerequisites", {"prerequisite": "SV101"})[0] == 409
+
+
+def test_routes_are_timed_separately():
+    service = make_service()
+    instrumentation.REGISTRY.reset()
+    instrumentation.enable()
+    try:
+        service.dispatch("GET", "/students/s1/eligibility/SV201", {})
+        service.dispatch("POST", "/students/s1/enroll", {"code": "SV201"})
+        service.dispatch("POST", "/students/s1/enroll", {"code": "SV201"})
+        service.dispatch("POST", "/advise", {"semester": 1, "cgpa": 2.0})
+    finally:
+        instrumentation.disable()
+    counts = {name: histogram.count for name, histogram in instrumentation.REGISTRY.latency.items() if name.startswith("service.")}
+    instrumentation.REGISTRY.reset()
+    assert counts == {"service.dispatch": 4, "service.check_eligibility": 1, "service.enroll": 2, "service.advise": 1}
@@ -0,0 +1,77 @@
+import random
+
+import pandas as pd
+import pytest
+
+import registration_system as registration
+
+
+def make_case(seed, course_count=60, student_count=300):
+    # A random catalogue in which some prerequisites are codes of courses that do not exist,
+    # and a cohort whose transcripts mix passed, failed and unknown codes.
+    rng = random.Random(seed)
+    codes = [f"S{seed}C{index}" for index in range(course_count)]
+    dangling = [f"S{seed}X{index}" for index in range(3)]
+    knowledge_base = registration.KnowledgeBase()
+    for index, code in enumerate(codes):
+        prerequisites = rng.sample(codes[:index], min(index, rng.randint(0, 3)))
+        if rng.random() < 0.1:
+            prerequisites.append(rng.choice(dangling))
+        knowledge_base.add_course(registration.Course(code, f"Course {index}", rng.choice((2, 3, 4)), 2, 1, rng.randint(0, 8), "Core", prerequisites))
+    rows = []
+    for _ in range(student_count):
+        passed = rng.sample(codes + dangling, rng.randint(0, course_count // 2))
+        failed = rng.sample(codes, rng.randint(0, 4))
+        rows.append({
+            "semester": rng.randint(0, 8),
+            "cgpa": round(rng.uniform(0.0, 4.0), 2),
+            "passed_courses": passed,
+            # BatchAdvisor also accepts comma-separated strings, as read from a spreadsheet.
+            "failed_courses": ",".join(failed) if rng.random() < 0.5 else failed,
+        })
+    return knowledge_base, pd.DataFrame(rows)
+
+
+def expected_advice(knowledge_base, row):
+    student = registration.Student()
+    student.set_semester(row["semester"])
+    student.set_cgpa(row["cgpa"])
+    for code in row["passed_courses"]:
+        student.add_passed_course(code)
+    failed = row["failed_courses"]
+    for code in failed.split(",") if isinstance(failed, str) else failed:
+        if code:
+            student.add_failed_course(code)
+    return [course.code for course in knowledge_base.advise_courses(student)], student.max_credit_hours()
+
+
+def assert_matches_per_student(knowledge_base, students, result):
+    assert list(result.index) == list(students.index)
+    for index, row in students.iterrows():
+        advised_courses, max_credit_hours = expected_advice(knowledge_base, row)
+        assert result.at[index, "advised_courses"] == advised_courses
+        assert sorted(result.at[index, "eligible_courses"]) == sorted(advised_courses)
+        assert result.at[index, "max_credit_hours"] == max_credit_hours
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_batch_matches_advise_courses(seed):
+    knowledge_base, students = make_case(seed)
+    result = registration.BatchAdvisor(knowledge_base).advise(students)
+    assert_matches_per_student(knowledge_base, students, result)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batch_matches_advise_courses_with_workers(seed):
+    knowledge_base, students = make_case(seed)
+    result = registration.BatchAdvisor(knowledge_base).advise(students, workers=2, chunk_size=64)
+    assert_matches_per_student(knowledge_base, students, result)
+
+
+def test_batch_after_catalogue_edits():
+    knowledge_base, students = make_case(99)
+    codes = knowledge_base.get_all_course_codes()
+    knowledge_base.add_prerequisite(codes[-1], codes[0])
+    knowledge_base.delete_course(codes[len(codes) // 2])
+    result = registration.BatchAdvisor(knowledge_base).advise(students)
+    assert_matches_per_student(knowledge_base, students, result)
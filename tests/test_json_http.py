@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import json_http
+
+
+async def echo(method, path, body):
+    if path == "/fail":
+        raise RuntimeError("scoring failed")
+    if path == "/metrics":
+        return 200, "metric 1\n"
+    return 200, {"method": method, "path": path, "body": body}
+
+
+async def exchange(requests):
+    server = await asyncio.start_server(lambda reader, writer: json_http.serve_connection(reader, writer, echo), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    responses = []
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for request in requests:
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            body = await reader.readexactly(int(headers["content-length"]))
+            responses.append((int(status_line.split()[1]), headers, body))
+        writer.close()
+    return responses
+
+
+def request(method, target, body=b"", connection="keep-alive"):
+    return f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\nConnection: {connection}\r\n\r\n".encode() + body
+
+
+def test_keep_alive_connection_serves_every_request():
+    responses = asyncio.run(exchange([
+        request("POST", "/students/a%20b/enroll?x=1", b'{"code": "CS101"}'),
+        request("GET", "/metrics"),
+        request("POST", "/advise", b"{not json"),
+        request("POST", "/fail", b"{}"),
+        request("GET", "/health", connection="close"),
+    ]))
+    assert [status for status, _, _ in responses] == [200, 200, 400, 500, 200]
+    assert json.loads(responses[0][2]) == {"method": "POST", "path": "/students/a b/enroll", "body": {"code": "CS101"}}
+    assert responses[1][1]["content-type"].startswith("text/plain") and responses[1][2] == b"metric 1\n"
+    assert json.loads(responses[4][2])["body"] == {}
+    assert responses[4][1]["connection"] == "close"
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+import registration_system as registration
+
+
+def expected_closures(knowledge_base):
+    closures = {}
+
+    def closure(code):
+        if code not in closures:
+            result = set()
+            for prerequisite in knowledge_base.prerequisite_graph.get(code, ()):
+                result.add(prerequisite)
+                result |= closure(prerequisite)
+            closures[code] = result
+        return closures[code]
+
+    for code in knowledge_base.courses:
+        closure(code)
+    return closures
+
+
+def assert_index_matches_catalogue(knowledge_base, rng, prefix):
+    courses = knowledge_base.courses
+    assert {code: set(course.prerequisites) for code, course in courses.items()} == knowledge_base.prerequisite_graph
+
+    referenced = {prerequisite for course in courses.values() for prerequisite in course.prerequisites}
+    position = knowledge_base._topological_position
+    assert set(position) == set(courses) | referenced
+    assert len(set(position.values())) == len(position)
+    for code, course in courses.items():
+        for prerequisite in course.prerequisites:
+            assert position[prerequisite] < position[code]
+
+    dependents = {}
+    for code, course in courses.items():
+        for prerequisite in course.prerequisites:
+            dependents.setdefault(prerequisite, set()).add(code)
+    assert {code: codes for code, codes in knowledge_base.dependent_graph.items() if codes} == dependents
+
+    entry_codes = {}
+    for code, course in courses.items():
+        if not course.prerequisites:
+            entry_codes.setdefault(course.semester, set()).add(code)
+    assert {semester: codes for semester, codes in knowledge_base.entry_index.items() if codes} == entry_codes
+
+    closures = expected_closures(knowledge_base)
+    for code in courses:
+        assert knowledge_base.prerequisite_closure(code) == closures[code]
+        assert knowledge_base.unlock_count(code) == sum(code in closure for closure in closures.values())
+
+    for _ in range(20):
+        student = registration.Student()
+        student.set_semester(rng.randint(0, 8))
+        passed = set(rng.sample(sorted(courses) + [f"{prefix}X0"], rng.randint(0, len(courses) // 2)))
+        failed = set(rng.sample(sorted(courses), min(len(courses), rng.randint(0, 3))))
+        for code in passed:
+            student.add_passed_course(code)
+        for code in failed:
+            student.add_failed_course(code)
+        advised = [course.code for course in knowledge_base.advise_courses(student)]
+        eligible = {
+            code for code, course in courses.items()
+            if code not in passed and course.semester <= student.semester and set(course.prerequisites) <= passed
+        }
+        assert sorted(advised) == sorted(eligible)
+        retakes = [code for code in advised if code in failed]
+        assert advised[:len(retakes)] == retakes
+        for group in (retakes, advised[len(retakes):]):
+            assert [position[code] for code in group] == sorted(position[code] for code in group)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_index_matches_recomputation(seed):
+    # Random catalogue edits, with closures and unlock counts read in between so that the cached
+    # values are extended and invalidated rather than computed from scratch at the end.
+    rng = random.Random(seed)
+    prefix = f"K{seed}"
+    knowledge_base = registration.KnowledgeBase()
+    next_index = 0
+    for step in range(150):
+        codes = sorted(knowledge_base.courses)
+        operation = rng.random()
+        if operation < 0.45 or len(codes) < 2:
+            code = f"{prefix}C{next_index}" if rng.random() < 0.85 or not codes else rng.choice(codes)
+            next_index += 1
+            pool = codes + [f"{prefix}X{index}" for index in range(3)]
+            prerequisites = rng.sample(pool, min(len(pool), rng.randint(0, 3)))
+            closures = expected_closures(knowledge_base)
+            creates_cycle = any(prerequisite == code or code in closures.get(prerequisite, ()) for prerequisite in prerequisites)
+            course = registration.Course(code, code, rng.choice((2, 3, 4)), 2, 1, rng.randint(0, 8), "Core", prerequisites)
+            if creates_cycle:
+                with pytest.raises(ValueError):
+                    knowledge_base.add_course(course)
+            else:
+                knowledge_base.add_course(course)
+        elif operation < 0.8:
+            code, prerequisite = rng.sample(codes, 2)
+            already = prerequisite in knowledge_base.courses[code].prerequisites
+            creates_cycle = code in expected_closures(knowledge_base)[prerequisite]
+            error = knowledge_base.add_prerequisite(code, prerequisite)
+            assert (error is None) == (not already and not creates_cycle)
+        else:
+            code = rng.choice(codes)
+            assert knowledge_base.delete_course(code) == f"Course {code} deleted successfully."
+        for code in rng.sample(sorted(knowledge_base.courses), min(3, len(knowledge_base.courses))):
+            knowledge_base.prerequisite_closure(code)
+            knowledge_base.unlock_count(code)
+        if step % 10 == 9:
+            assert_index_matches_catalogue(knowledge_base, rng, prefix)
+    assert_index_matches_catalogue(knowledge_base, rng, prefix)
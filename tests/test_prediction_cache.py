@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from fake_news_inference import FakeNewsModel, PredictionCache
+
+TRAINING_TEXTS = [
+    "finance markets rally on strong earnings",
+    "central bank holds finance rates steady",
+    "aliens secretly run the finance ministry",
+    "miracle cure hidden by doctors revealed",
+    "local council approves new school budget",
+    "celebrity clone spotted at secret moon base",
+]
+TRAINING_LABELS = [0, 0, 1, 1, 0, 1]
+
+
+def make_model(version, vectorizer, cache, C=1.0):
+    X = vectorizer.fit_transform(TRAINING_TEXTS)
+    classifier = LogisticRegression(C=C).fit(X, TRAINING_LABELS)
+    return FakeNewsModel(vectorizer, classifier, {"version": version}, cache)
+
+
+def uncached(model, texts):
+    return model.classifier.predict_proba(model.vectorizer.transform(texts))
+
+
+def test_text_hash_is_no_coarser_than_the_vectorizer():
+    assert PredictionCache.text_hash("Finance  markets\n rally") == PredictionCache.text_hash("finance markets rally")
+    assert PredictionCache.text_hash("ﬁnance markets") != PredictionCache.text_hash("finance markets")
+
+
+@pytest.mark.parametrize("vectorizer", [CountVectorizer(), HashingVectorizer(n_features=2**10, alternate_sign=False)])
+def test_cached_probabilities_match_the_model(vectorizer):
+    # The ligature spelling is a different token to both vectorizers, so it must not be served
+    # the plain spelling's cached row.
+    model = make_model("v1", vectorizer, PredictionCache())
+    texts = ["finance markets rally", "ﬁnance markets rally", "FINANCE   markets rally", "ﬁnance markets rally"]
+    np.testing.assert_allclose(model.predict_proba(texts), uncached(model, texts))
+    np.testing.assert_allclose(model.predict_proba(texts[::-1]), uncached(model, texts[::-1]))
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_models_of_different_versions_share_one_cache(tmp_path, on_disk):
+    cache = PredictionCache(disk_path=str(tmp_path / "cache.sqlite") if on_disk else None)
+    old = make_model("v1", CountVectorizer(), cache, C=100.0)
+    new = make_model("v2", CountVectorizer(), cache, C=0.01)
+    texts = ["finance markets rally", "secret moon base clone", "school budget approved"]
+    assert not np.allclose(uncached(old, texts), uncached(new, texts))
+    for _ in range(2):
+        for text in texts:
+            for model in (old, new, old):
+                np.testing.assert_allclose(model.predict_proba([text]), uncached(model, [text]))
+    assert cache.stats() == {"entries": 6, "hits": 12, "disk_hits": 0, "misses": 6, "evictions": 0}
+
+
+def test_lru_eviction_and_counters():
+    cache = PredictionCache(max_entries=2)
+    cache.put_many("v1", [(b"a", [0.1, 0.9]), (b"b", [0.2, 0.8])])
+    np.testing.assert_allclose(cache.get("v1", b"a"), [0.1, 0.9])
+    cache.put_many("v1", [(b"c", [0.3, 0.7])])
+    # b was the least recently used entry, so it is the one evicted.
+    assert cache.get("v1", b"b") is None
+    assert cache.get("v1", b"a") is not None and cache.get("v1", b"c") is not None
+    assert cache.get("v2", b"a") is None
+    assert cache.stats() == {"entries": 2, "hits": 3, "disk_hits": 0, "misses": 2, "evictions": 1}
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = PredictionCache(disk_path=path)
+    old = make_model("v1", CountVectorizer(), cache, C=100.0)
+    model = make_model("v2", CountVectorizer(), cache, C=0.01)
+    texts = ["finance markets rally", "secret moon base clone"]
+    old.predict_proba(texts)
+    expected = model.predict_proba(texts)
+    cache.disk.close()
+
+    # Loading v2 again evicts v1's rows and serves v2's from disk without recomputing them.
+    cache = PredictionCache(disk_path=path)
+    model = FakeNewsModel(model.vectorizer, model.classifier, {"version": "v2"}, cache)
+    np.testing.assert_allclose(model.predict_proba(texts), expected)
+    assert cache.stats() == {"entries": 2, "hits": 0, "disk_hits": 2, "misses": 0, "evictions": 0}
+    assert cache.disk.execute("SELECT DISTINCT model_version FROM predictions").fetchall() == [("v2",)]
+    cache.disk.close()
+
+
+def test_disk_rows_from_another_key_scheme_are_dropped(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = PredictionCache(disk_path=path)
+    cache.put_many("v1", [(b"a", [0.1, 0.9])])
+    cache.disk.execute("PRAGMA user_version = 1")
+    cache.disk.close()
+    cache = PredictionCache(disk_path=path)
+    assert cache.get("v1", b"a") is None
+    cache.disk.close()
@@ -0,0 +1,107 @@
+import threading
+
+import registration_system as registration
+
+# A CGPA below 1.67 allows 13 credit hours, so at most three 4-credit courses fit.
+HALF_LOAD_CGPA = 1.5
+
+
+def make_database(path, course_count=6):
+    store = registration.RegistrationStore(path)
+    store.save_courses([registration.Course(f"RS{index}", f"Course {index}", 4, 3, 1, 1, "Core") for index in range(course_count)])
+    student = registration.Student()
+    student.set_semester(1)
+    student.set_cgpa(HALF_LOAD_CGPA)
+    store.save_student("s1", student)
+    store.close()
+
+
+def stored_credit_hours(path):
+    store = registration.RegistrationStore(path)
+    try:
+        return store.connection.execute("SELECT COALESCE(SUM(credit_hours), 0) FROM enrollments WHERE student_id = 's1'").fetchone()[0]
+    finally:
+        store.close()
+
+
+def test_stale_connections_cannot_enroll_past_the_cap(tmp_path):
+    path = str(tmp_path / "registration.sqlite")
+    make_database(path)
+    stores = [registration.RegistrationStore(path) for _ in range(2)]
+    knowledge_base = stores[0].load_knowledge_base()
+    # Both connections cache the student before either enrolls, so both start from 0 credit hours.
+    for store in stores:
+        assert store.get_student("s1", knowledge_base).registered_credit_hours() == 0
+    results = [stores[index % 2].enroll("s1", knowledge_base.get_course_by_code(f"RS{index}"), knowledge_base) for index in range(4)]
+    assert [enrolled for enrolled, _ in results] == [True, True, True, False]
+    assert "maximum credit hour limit" in results[3][1]
+    for store in stores:
+        store.close()
+    assert stored_credit_hours(path) == 12
+
+
+def test_concurrent_connections_cannot_enroll_past_the_cap(tmp_path):
+    path = str(tmp_path / "registration.sqlite")
+    make_database(path)
+    barrier = threading.Barrier(6)
+    results = []
+
+    def register(index):
+        store = registration.RegistrationStore(path)
+        try:
+            knowledge_base = store.load_knowledge_base()
+            course = knowledge_base.get_course_by_code(f"RS{index}")
+            barrier.wait()
+            results.append(store.enroll("s1", course, knowledge_base)[0])
+        finally:
+            store.close()
+
+    threads = [threading.Thread(target=register, args=(index,)) for index in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == [False, False, False, True, True, True]
+    assert stored_credit_hours(path) == 12
+
+
+def test_duplicate_enroll_and_unknown_drop_are_reported(tmp_path):
+    path = str(tmp_path / "registration.sqlite")
+    make_database(path)
+    store = registration.RegistrationStore(path)
+    knowledge_base = store.load_knowledge_base()
+    course = knowledge_base.get_course_by_code("RS0")
+    assert store.enroll("s1", course, knowledge_base)[0]
+    assert store.enroll("s1", course, knowledge_base) == (False, "You are already enrolled in this course.")
+    assert store.drop("s1", "RS0", knowledge_base)[0]
+    assert not store.drop("s1", "RS0", knowledge_base)[0]
+    store.close()
+
+
+def test_service_writes_through_the_store(tmp_path):
+    path = str(tmp_path / "registration.sqlite")
+    make_database(path)
+    store = registration.RegistrationStore(path)
+    service = registration.AdvisingService(store.load_knowledge_base(), store)
+    assert service.dispatch("PUT", "/students/s2", {"semester": 2, "cgpa": 3.5, "passed_courses": ["RS0"]})[0] == 201
+    assert service.dispatch("POST", "/students/s2/enroll", {"code": "RS1"})[0] == 200
+    assert service.dispatch("POST", "/students/s1/enroll", {"code": "RS1"})[0] == 200
+    assert service.dispatch("POST", "/courses", {"code": "RS9", "name": "Capstone", "credit_hours": 3, "semester": 2, "prerequisites": ["RS0"]})[0] == 201
+    assert service.dispatch("POST", "/courses/RS9/prerequisites", {"prerequisite": "RS1"})[0] == 200
+    assert service.dispatch("DELETE", "/courses/RS5", {})[0] == 200
+    store.close()
+
+    # A second process sharing the database sees every change, and its enrollments count.
+    store = registration.RegistrationStore(path)
+    knowledge_base = store.load_knowledge_base()
+    assert "RS5" not in knowledge_base.courses
+    assert knowledge_base.prerequisite_graph["RS9"] == {"RS0", "RS1"}
+    other = registration.AdvisingService(knowledge_base, store)
+    assert [course.code for course in store.get_student("s2", knowledge_base).registered_courses] == ["RS1"]
+    for code in ("RS2", "RS3"):
+        assert other.dispatch("POST", "/students/s1/enroll", {"code": code})[0] == 200
+    assert other.dispatch("POST", "/students/s1/enroll", {"code": "RS4"})[0] == 409
+    assert other.dispatch("POST", "/students/s1/drop", {"code": "RS2"})[0] == 200
+    assert other.dispatch("POST", "/students/s1/drop", {"code": "RS2"})[0] == 404
+    store.close()
+    assert stored_credit_hours(path) == 8
@@ -0,0 +1,55 @@
+import itertools
+import random
+
+import pytest
+
+import registration_system as registration
+
+
+def make_candidates(rng):
+    # Few distinct credit-hour weights, so that pruning has same-weight courses to drop.
+    count = rng.randint(0, 12)
+    candidates = []
+    for index in range(count):
+        weight = rng.choice((0, 1, 2, 2, 3, 3, 3, 4))
+        candidates.append((weight + rng.randint(1, 14), weight, f"P{index}"))
+    candidates.sort(key=lambda candidate: -candidate[0])
+    return candidates
+
+
+def brute_force_values(candidates, credit_hours, top_k):
+    values = []
+    for size in range(1, len(candidates) + 1):
+        for subset in itertools.combinations(candidates, size):
+            if sum(candidate[1] for candidate in subset) <= credit_hours:
+                values.append(sum(candidate[0] for candidate in subset))
+    return sorted(values, reverse=True)[:top_k]
+
+
+def assert_valid_schedules(schedules, candidates, credit_hours):
+    by_code = {candidate[2]: candidate for candidate in candidates}
+    for value, codes in schedules:
+        assert len(set(codes)) == len(codes)
+        assert sum(by_code[code][1] for code in codes) <= credit_hours
+        assert sum(by_code[code][0] for code in codes) == value
+    assert len({frozenset(codes) for _, codes in schedules}) == len(schedules)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_best_schedules_match_exhaustive_search(seed):
+    rng = random.Random(seed)
+    for _ in range(20):
+        candidates = make_candidates(rng)
+        credit_hours = rng.randint(0, 14)
+        top_k = rng.randint(1, 5)
+        expected = brute_force_values(candidates, credit_hours, top_k)
+
+        schedules = registration.best_schedules(tuple(candidates), credit_hours, top_k)
+        assert [value for value, _ in schedules] == expected
+        assert_valid_schedules(schedules, candidates, credit_hours)
+
+        pruned = registration.prune_dominated_candidates(candidates, credit_hours, top_k)
+        assert [candidate for candidate in candidates if candidate in pruned] == pruned
+        schedules = registration.best_schedules(tuple(pruned), credit_hours, top_k)
+        assert [value for value, _ in schedules] == expected
+        assert_valid_schedules(schedules, pruned, credit_hours)